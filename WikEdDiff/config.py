@@ -2,7 +2,7 @@
 
 import re
 
-from .utils import dotdictify
+from .utils import dotdictify, char_class_set
 
 __all__ = ["WikEdDiffConfig"]
 
@@ -295,6 +295,12 @@ class WikEdDiffConfig:
                 ']+',
                 re.MULTILINE
         ),
+        # New line chars of clipLine other than '\n', for the plain '\n' fast path of line clipping
+        'clipOtherNewLines': re.compile(
+                '[\\r' + regExpNewLines +
+                regExpNewParagraph +
+                ']'
+        ),
         'clipHeading': re.compile(
                 '( ^|\\n)(==+.+?==+|\\{\\||\\|\\}).*?(?=\\n|$)', re.MULTILINE ),
         'clipParagraph': re.compile(
@@ -335,3 +341,10 @@ class WikEdDiffConfig:
                 ']+'
         )
     })
+
+    # Blank characters excluded by regExp.blankOnlyToken, for blank tests without the regExp
+    blankChars = char_class_set(
+            regExpBlanks +
+            regExpNewLinesAll +
+            regExpNewParagraph
+    )
@@ -3,7 +3,8 @@
 """
 Main data structures used in the WikEdDiff class. In the original JavaScript
 code they were represented as plain tables, but in Python we need to create
-custom objects.
+custom objects. All of them are slotted to keep the per-instance footprint
+small, because they are created in large numbers for long texts.
 
 See the wikeddiff script for documentation.
 """
@@ -13,42 +14,21 @@ from dataclasses import dataclass
 
 
 ##
-## Token element.
-##
-## @class Token
-##
-@dataclass
-class Token:
-    token: str
-    prev: Token
-    next: Token
-    link: int
-    number: int
-    unique: bool
-
-##
-## Symbols table.
+## Symbols table, symbol data is stored as parallel arrays indexed by symbol.
 ##
 ## @class Symbols
 ##
 @dataclass
 class Symbols:
-    token: list
+    __slots__ = ('hashTable', 'newCount', 'oldCount', 'newToken', 'oldToken', 'linked')
+
     hashTable: dict
+    newCount: list
+    oldCount: list
+    newToken: list
+    oldToken: list
     linked: bool
 
-##
-## Symbol element.
-##
-## @class Symbol
-##
-@dataclass
-class Symbol:
-    newCount: int
-    oldCount: int
-    newToken: int
-    oldToken: Token
-
 
 ##
 ## Gap element.
@@ -57,6 +37,8 @@ class Symbol:
 ##
 @dataclass
 class Gap:
+    __slots__ = ('newFirst', 'newLast', 'newTokens', 'oldFirst', 'oldLast', 'oldTokens', 'charSplit')
+
     newFirst: int
     newLast: int
     newTokens: int
@@ -72,6 +54,8 @@ class Gap:
 ##
 @dataclass
 class Block:
+    __slots__ = ('oldBlock', 'newBlock', 'oldNumber', 'newNumber', 'oldStart', 'count', 'unique', 'words', 'chars', 'type', 'section', 'group', 'fixed', 'moved', 'text')
+
     oldBlock: int
     newBlock: int
     oldNumber: int
@@ -95,6 +79,8 @@ class Block:
 ##
 @dataclass
 class Section:
+    __slots__ = ('blockStart', 'blockEnd')
+
     blockStart: int
     blockEnd: int
 
@@ -106,6 +92,8 @@ class Section:
 ##
 @dataclass
 class Group:
+    __slots__ = ('oldNumber', 'blockStart', 'blockEnd', 'unique', 'maxWords', 'words', 'chars', 'fixed', 'movedFrom', 'color')
+
     oldNumber: int
     blockStart: int
     blockEnd: int
@@ -125,13 +113,9 @@ class Group:
 ##
 @dataclass
 class Fragment:
+    __slots__ = ('text', 'color', 'type')
+
     text: str
     color: int
     type: str
 
-
-# TODO
-@dataclass
-class CacheEntry:
-    path: list
-    chars: int
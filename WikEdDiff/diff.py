@@ -61,13 +61,15 @@ class WikEdDiffText:  diff text object (new or old version)
   .first                index of first token in tokens list
   .last                 index of last token in tokens list
 
-  .tokens[]:          token list for new or old string (doubly-linked list) (N and O)
-    .prev               previous list item
-    .next               next list item
-    .token              token string
-    .link               index of corresponding token in new or old text (OA and NA)
-    .number             list enumeration number
-    .unique             token is unique word in text
+  token list for new or old string (doubly-linked list) (N and O), stored as
+  parallel arrays indexed by token index:
+  .tokens[]             token string
+  .ids[]                token string id, equal ids for equal strings in both versions
+  .prev[]               previous list item
+  .next[]               next list item
+  .link[]               index of corresponding token in new or old text (OA and NA)
+  .number[]             list enumeration number
+  .unique[]             token is unique word in text
 
 class WikEdDiff:      diff object
   .config[]:            configuration settings, see top of code for customization options
@@ -76,16 +78,19 @@ class WikEdDiff:      diff object
   .newText              new text
   .oldText              old text
   .maxWords             word count of longest linked block
+  .blockWords{}         word counts of '=' block texts during block detection, text => count
   .error                flag: result has not passed unit tests
-  .bordersDown[]        linked region borders downwards, [new index, old index]
-  .bordersUp[]          linked region borders upwards, [new index, old index]
+  .uniqueWords          set of words and chunks that occur only once in both versions
+  .tokenIds{}           token string ids shared by new and old text, token string => id
+  .bordersDown[]        linked region borders downwards, (new index, old index)
+  .bordersUp[]          linked region borders upwards, (new index, old index)
   .symbols:             symbols table for whole text at all refinement levels
-    .token[]              hash table of parsed tokens for passes 1 - 3, points to symbol[i]
-    .symbol[]:            array of objects that hold token counters and pointers:
-      .newCount             new text token counter (NC)
-      .oldCount             old text token counter (OC)
-      .newToken             token index in text.newText.tokens
-      .oldToken             token index in text.oldText.tokens
+    .hashTable{}          hash table of parsed token ids for passes 1 - 3, points to symbol index
+    symbol data, stored as parallel arrays indexed by symbol index:
+    .newCount[]           new text token counter (NC)
+    .oldCount[]           old text token counter (OC)
+    .newToken[]           token index in text.newText.tokens
+    .oldToken[]           token index in text.oldText.tokens
     .linked               flag: at least one unique token pair has been linked
 
   .blocks[]:            array, block data (consecutive text tokens) in new text order
@@ -134,9 +139,11 @@ class WikEdDiff:      diff object
 
 import re
 import time
-import itertools
-import copy
 import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from operator import attrgetter, eq
 
 from .utils import *
 from .data_structures import *
@@ -170,7 +177,7 @@ class WikEdDiff:
         self.oldText = None
 
         # @var Symbols symbols Symbols table for whole text at all refinement levels
-        self.symbols = Symbols(token=[], hashTable={}, linked=False)
+        self.symbols = Symbols(hashTable={}, newCount=[], oldCount=[], newToken=[], oldToken=[], linked=False)
 
         # @var array bordersDown Matched region borders downwards
         self.bordersDown = []
@@ -178,12 +185,24 @@ class WikEdDiff:
         # @var array bordersUp Matched region borders upwards
         self.bordersUp = []
 
+        # @var frozenset uniqueWords Words and chunks that occur only once in both versions
+        self.uniqueWords = frozenset()
+
+        # @var dict tokenIds Token string ids shared by new and old text, token string => id
+        self.tokenIds = {}
+
+        # @var dict splitCaptures Split regExps wrapped in a capturing group for re.split(), regExp => regExp
+        self.splitCaptures = {}
+
         # @var array blocks Block data (consecutive text tokens) in new text order
         self.blocks = []
 
         # @var int maxWords Maximal detected word count of all linked blocks
         self.maxWords = 0
 
+        # @var dict blockWords Word counts of '=' block texts, reused when blocks are re-detected after unlinking
+        self.blockWords = {}
+
         # @var array groups Section blocks that are consecutive in old text order
         self.groups = []
 
@@ -241,7 +260,22 @@ class WikEdDiff:
             fragments.append( Fragment( text='', type='}', color=0 ) )
             return fragments
 
+        # Parse and count words and chunks for identification of unique real words
+        if self.config.timer is True:
+            self.time( 'wordParse' )
+        self.wordParse()
+        if self.config.timer is True:
+            self.timeEnd( 'wordParse' )
+
+        # Collect words and chunks that are unique in both versions
+        newWords = self.newText.words
+        self.uniqueWords = frozenset(
+            word for word, count in self.oldText.words.items()
+            if count == 1 and newWords.get(word) == 1
+        )
+
         # Split new and old text into paragraps
+        self.tokenIds.clear()
         if self.config.timer is True:
             self.time( 'paragraph split' )
         self.newText.splitText( 'paragraph' )
@@ -252,84 +286,59 @@ class WikEdDiff:
         # Calculate diff
         self.calculateDiff( 'line' )
 
-        # Refine different paragraphs into lines
-        if self.config.timer is True:
-            self.time( 'line split' )
-        self.newText.splitRefine( 'line' )
-        self.oldText.splitRefine( 'line' )
-        if self.config.timer is True:
-            self.timeEnd( 'line split' )
-
-        # Calculate refined diff
-        self.calculateDiff( 'line' )
-
-        # Refine different lines into sentences
-        if self.config.timer is True:
-            self.time( 'sentence split' )
-        self.newText.splitRefine( 'sentence' )
-        self.oldText.splitRefine( 'sentence' )
-        if self.config.timer is True:
-            self.timeEnd( 'sentence split' )
-
-        # Calculate refined diff
-        self.calculateDiff( 'sentence' )
-
-        # Refine different sentences into chunks
-        if self.config.timer is True:
-            self.time( 'chunk split' )
-        self.newText.splitRefine( 'chunk' )
-        self.oldText.splitRefine( 'chunk' )
-        if self.config.timer is True:
-            self.timeEnd( 'chunk split' )
-
-        # Calculate refined diff
-        self.calculateDiff( 'chunk' )
-
-        # Refine different chunks into words
-        if self.config.timer is True:
-            self.time( 'word split' )
-        self.newText.splitRefine( 'word' )
-        self.oldText.splitRefine( 'word' )
-        if self.config.timer is True:
-            self.timeEnd( 'word split' )
-
-        # Calculate refined diff information with recursion for unresolved gaps
-        self.calculateDiff( 'word', True )
-
-        # Slide gaps
-        if self.config.timer is True:
-            self.time( 'word slide' )
-        self.slideGaps( self.newText, self.oldText )
-        self.slideGaps( self.oldText, self.newText )
-        if self.config.timer is True:
-            self.timeEnd( 'word slide' )
-
-        # Split tokens into chars
-        if self.config.charDiff is True:
-            # Split tokens into chars in selected unresolved gaps
+        # Refine different paragraphs into lines, sentences, chunks, and words,
+        # stop when all tokens of both versions have been linked
+        refined = True
+        for level in ( 'line', 'sentence', 'chunk', 'word' ):
             if self.config.timer is True:
-                self.time( 'character split' )
-            self.splitRefineChars()
+                self.time( level + ' split' )
+            refined = self.newText.splitRefine( level ) + self.oldText.splitRefine( level ) > 0
             if self.config.timer is True:
-                self.timeEnd( 'character split' )
+                self.timeEnd( level + ' split' )
+            if refined is False:
+                break
 
-            # Calculate refined diff information with recursion for unresolved gaps
-            self.calculateDiff( 'character', True )
+            # Calculate refined diff, with recursion for unresolved gaps at word level
+            self.calculateDiff( level, level == 'word' )
 
+        # Unresolved gaps are left
+        if refined is True:
             # Slide gaps
             if self.config.timer is True:
-                self.time( 'character slide' )
+                self.time( 'word slide' )
             self.slideGaps( self.newText, self.oldText )
             self.slideGaps( self.oldText, self.newText )
             if self.config.timer is True:
-                self.timeEnd( 'character slide' )
+                self.timeEnd( 'word slide' )
+
+            # Split tokens into chars
+            if self.config.charDiff is True:
+                # Split tokens into chars in selected unresolved gaps
+                if self.config.timer is True:
+                    self.time( 'character split' )
+                self.splitRefineChars()
+                if self.config.timer is True:
+                    self.timeEnd( 'character split' )
+
+                # Calculate refined diff information with recursion for unresolved gaps
+                self.calculateDiff( 'character', True )
+
+                # Slide gaps
+                if self.config.timer is True:
+                    self.time( 'character slide' )
+                self.slideGaps( self.newText, self.oldText )
+                self.slideGaps( self.oldText, self.newText )
+                if self.config.timer is True:
+                    self.timeEnd( 'character slide' )
 
         # Free memory
-        self.symbols = Symbols(token=[], hashTable={}, linked=False)
+        self.symbols = Symbols(hashTable={}, newCount=[], oldCount=[], newToken=[], oldToken=[], linked=False)
         self.bordersDown.clear()
         self.bordersUp.clear()
         self.newText.words.clear()
         self.oldText.words.clear()
+        self.uniqueWords = frozenset()
+        self.tokenIds.clear()
 
         # Enumerate token lists
         self.newText.enumerateTokens()
@@ -343,8 +352,8 @@ class WikEdDiff:
             self.timeEnd( 'blocks' )
 
         # Free memory
-        self.newText.tokens.clear()
-        self.oldText.tokens.clear()
+        self.newText.clearTokens()
+        self.oldText.clearTokens()
 
         # Assemble blocks into fragment table
         fragments = self.getDiffFragments()
@@ -391,6 +400,43 @@ class WikEdDiff:
         return fragments
 
 
+    ##
+    ## Parse and count words and chunks of both versions for identification of unique words.
+    ## Unchanged lines at the start and end of the texts are parsed only once, the count
+    ## regExps do not match across new lines.
+    ##
+    ## @param[in] string newText.text, oldText.text Texts of versions
+    ## @param[out] array newText.words, oldText.words Number of word occurrences
+    ##
+    def wordParse( self ):
+
+        newString = self.newText.text
+        oldString = self.oldText.text
+
+        # Common start of both texts, cut after its last new line
+        prefix = common_prefix_length( newString, oldString )
+        newStart = newString.rfind( '\n', 0, prefix ) + 1
+
+        # Common end of both texts not overlapping the common start, cut after its first new line
+        suffix = common_suffix_length( newString, oldString, min(len(newString), len(oldString)) - prefix )
+        newEnd = newString.find( '\n', len(newString) - suffix ) + 1
+        if newEnd == 0:
+            newEnd = len(newString)
+        oldStart = newStart
+        oldEnd = len(oldString) - (len(newString) - newEnd)
+
+        # Count whole matches, the regExps contain inner groups
+        matchText = re.Match.group
+        for regExp in (self.config.regExp.countWords, self.config.regExp.countChunks):
+            finditer = regExp.finditer
+            shared = Counter( map( matchText, finditer(newString, 0, newStart) ) )
+            shared.update( map( matchText, finditer(newString, newEnd) ) )
+            self.newText.words.update( shared )
+            self.newText.words.update( map( matchText, finditer(newString, newStart, newEnd) ) )
+            self.oldText.words.update( shared )
+            self.oldText.words.update( map( matchText, finditer(oldString, oldStart, oldEnd) ) )
+
+
     ##
     ## Split tokens into chars in the following unresolved regions (gaps):
     ##   - One token became connected or separated by space or dash (or any token)
@@ -406,24 +452,33 @@ class WikEdDiff:
     ##
     def splitRefineChars(self):
 
+        # Bind token lists, splitText() only appends to them
+        newTokens = self.newText.tokens
+        newIds = self.newText.ids
+        newNext = self.newText.next
+        newLink = self.newText.link
+        oldTokens = self.oldText.tokens
+        oldIds = self.oldText.ids
+        oldNext = self.oldText.next
+        oldLink = self.oldText.link
+
         # Find corresponding gaps.
 
-        # Cycle through new text tokens list
+        # Cycle through new text tokens list, gap is the currently open gap
         gaps = []
         gap = None
         i = self.newText.first
         j = self.oldText.first
         while i is not None:
             # Get token links
-            newLink = self.newText.tokens[i].link
-            oldLink = None
+            iLink = newLink[i]
+            jLink = None
             if j is not None:
-                oldLink = self.oldText.tokens[j].link
+                jLink = oldLink[j]
 
             # Start of gap in new and old
-            if gap is None and newLink is None and oldLink is None:
-                gap = len(gaps)
-                gaps.append( Gap(
+            if gap is None and iLink is None and jLink is None:
+                gap = Gap(
                         newFirst  = i,
                         newLast   = i,
                         newTokens = 1,
@@ -431,36 +486,33 @@ class WikEdDiff:
                         oldLast   = j,
                         oldTokens = 0,
                         charSplit = None
-                ) )
+                )
+                gaps.append( gap )
 
             # Count chars and tokens in gap
-            elif gap is not None and newLink is None:
-                gaps[gap].newLast = i
-                gaps[gap].newTokens += 1
+            elif gap is not None and iLink is None:
+                gap.newLast = i
+                gap.newTokens += 1
 
             # Gap ended
-            elif gap is not None and newLink is not None:
+            elif gap is not None and iLink is not None:
                 gap = None
 
             # Next list elements
-            if newLink is not None:
-                j = self.oldText.tokens[newLink].next
-            i = self.newText.tokens[i].next
+            if iLink is not None:
+                j = oldNext[iLink]
+            i = newNext[i]
 
         # Cycle through gaps and add old text gap data
         for gap in gaps:
             # Cycle through old text tokens list
             j = gap.oldFirst
-            while (
-                    j is not None and
-                    self.oldText.tokens[j] is not None and
-                    self.oldText.tokens[j].link is None
-                    ):
+            while j is not None and oldLink[j] is None:
                 # Count old chars and tokens in gap
                 gap.oldLast = j
                 gap.oldTokens += 1
 
-                j = self.oldText.tokens[j].next
+                j = oldNext[j]
 
         # Select gaps of identical token number and strong similarity of all tokens.
         for gap in gaps:
@@ -470,15 +522,15 @@ class WikEdDiff:
             if gap.newTokens != gap.oldTokens:
                 # One word became separated by space, dash, or any string
                 if gap.newTokens == 1 and gap.oldTokens == 3:
-                    token = self.newText.tokens[ gap.newFirst ].token
-                    tokenFirst = self.oldText.tokens[ gap.oldFirst ].token
-                    tokenLast = self.oldText.tokens[ gap.oldLast ].token
+                    token = newTokens[ gap.newFirst ]
+                    tokenFirst = oldTokens[ gap.oldFirst ]
+                    tokenLast = oldTokens[ gap.oldLast ]
                     if not token.startswith(tokenFirst) or not token.endswith(tokenLast):
                         continue
                 elif gap.oldTokens == 1 and gap.newTokens == 3:
-                    token = self.oldText.tokens[ gap.oldFirst ].token
-                    tokenFirst = self.newText.tokens[ gap.newFirst ].token
-                    tokenLast = self.newText.tokens[ gap.newLast ].token
+                    token = oldTokens[ gap.oldFirst ]
+                    tokenFirst = newTokens[ gap.newFirst ]
+                    tokenLast = newTokens[ gap.newLast ]
                     if not token.startswith(tokenFirst) or not token.endswith(tokenLast):
                         continue
                 else:
@@ -490,46 +542,39 @@ class WikEdDiff:
                 i = gap.newFirst
                 j = gap.oldFirst
                 while i is not None:
-                    newToken = self.newText.tokens[i].token
-                    oldToken = self.oldText.tokens[j].token
+                    newToken = newTokens[i]
+                    oldToken = oldTokens[j]
+                    newLength = len(newToken)
+                    oldLength = len(oldToken)
 
                     # Get shorter and longer token
-                    if len(newToken) < len(oldToken):
+                    if newLength < oldLength:
                         shorterToken = newToken
                         longerToken = oldToken
+                        shorterLength = newLength
                     else:
                         shorterToken = oldToken
                         longerToken = newToken
+                        shorterLength = oldLength
 
                     # Not same token length
-                    if len(newToken) != len(oldToken):
+                    if newLength != oldLength:
 
                         # Test for addition or deletion of internal string in tokens
 
                         # Find number of identical chars from left
-                        left = 0
-                        while left < len(shorterToken):
-                            if newToken[ left ] != oldToken[ left ]:
-                                break
-                            left += 1
+                        left = common_prefix_length( newToken, oldToken )
 
                         # Find number of identical chars from right
-                        right = 0
-                        while right < len(shorterToken):
-                            if (
-                                    newToken[ len(newToken) - 1 - right ] !=
-                                    oldToken[ len(oldToken) - 1 - right ]
-                                    ):
-                                break
-                            right += 1
+                        right = common_suffix_length( newToken, oldToken, shorterLength )
 
                         # No simple insertion or deletion of internal string
-                        if left + right != len(shorterToken):
+                        if left + right != shorterLength:
                             # Not addition or deletion of flanking strings in tokens
                             # Smaller token not part of larger token
                             if shorterToken not in longerToken:
                                 # Same text at start or end shorter than different text
-                                if left < len(shorterToken) / 2 and right < len(shorterToken) / 2:
+                                if left * 2 < shorterLength and right * 2 < shorterLength:
                                     # Do not split into chars in this gap
                                     charSplit = False
                                     break
@@ -537,11 +582,8 @@ class WikEdDiff:
                     # Same token length
                     elif newToken != oldToken:
                         # Tokens less than 50 % identical
-                        ident = 0
-                        for pos in range(len(shorterToken)):
-                            if shorterToken[ pos ] == longerToken[ pos ]:
-                                ident += 1
-                        if ident / len(shorterToken) < 0.49:
+                        ident = sum( map( eq, shorterToken, longerToken ) )
+                        if ident * 100 < shorterLength * 49:
                             # Do not split into chars this gap
                             charSplit = False
                             break
@@ -549,8 +591,8 @@ class WikEdDiff:
                     # Next list elements
                     if i == gap.newLast:
                         break
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+                    i = newNext[i]
+                    j = oldNext[j]
                 gap.charSplit = charSplit
 
         # Refine words into chars in selected gaps.
@@ -567,10 +609,10 @@ class WikEdDiff:
                     # Link identical tokens (spaces) to keep char refinement to words
                     if (
                             newGapLength == oldGapLength and
-                            self.newText.tokens[i].token == self.oldText.tokens[j].token
+                            newIds[i] == oldIds[j]
                             ):
-                        self.newText.tokens[i].link = j
-                        self.oldText.tokens[j].link = i
+                        newLink[i] = j
+                        oldLink[j] = i
 
                     # Refine words into chars
                     else:
@@ -585,9 +627,9 @@ class WikEdDiff:
                     if j == gap.oldLast:
                         j = None
                     if i is not None:
-                        i = self.newText.tokens[i].next
+                        i = newNext[i]
                     if j is not None:
-                        j = self.oldText.tokens[j].next
+                        j = oldNext[j]
 
 
     ##
@@ -600,84 +642,92 @@ class WikEdDiff:
         regExpSlideBorder = self.config.regExp.slideBorder
         regExpSlideStop = self.config.regExp.slideStop
 
+        # Bind token lists used in the loops
+        tokens = text.tokens
+        ids = text.ids
+        prev = text.prev
+        next = text.next
+        link = text.link
+        linkedLink = textLinked.link
+
         # Cycle through tokens list
         i = text.first
         gapStart = None
         while i is not None:
 
             # Remember gap start
-            if gapStart is None and text.tokens[i].link is None:
+            if gapStart is None and link[i] is None:
                 gapStart = i
 
             # Find gap end
-            elif gapStart is not None and text.tokens[i].link is not None:
+            elif gapStart is not None and link[i] is not None:
                 gapFront = gapStart
-                gapBack = text.tokens[i].prev
+                gapBack = prev[i]
 
                 # Slide down as deep as possible
                 front = gapFront
-                back = text.tokens[gapBack].next
+                back = next[gapBack]
                 if (
                         front is not None and
                         back is not None and
-                        text.tokens[front].link is None and
-                        text.tokens[back].link is not None and
-                        text.tokens[front].token == text.tokens[back].token
+                        link[front] is None and
+                        link[back] is not None and
+                        ids[front] == ids[back]
                         ):
-                    text.tokens[front].link = text.tokens[back].link
-                    textLinked.tokens[ text.tokens[front].link ].link = front
-                    text.tokens[back].link = None
+                    link[front] = link[back]
+                    linkedLink[ link[front] ] = front
+                    link[back] = None
 
-                    gapFront = text.tokens[gapFront].next
-                    gapBack = text.tokens[gapBack].next
+                    gapFront = next[gapFront]
+                    gapBack = next[gapBack]
 
-                    front = text.tokens[front].next
-                    back = text.tokens[back].next
+                    front = next[front]
+                    back = next[back]
 
                 # Test slide up, remember last line break or word border
-                front = text.tokens[gapFront].prev
+                front = prev[gapFront]
                 back = gapBack
-                gapFrontBlankTest = regExpSlideBorder.search( text.tokens[gapFront].token )
+                gapFrontBlankTest = regExpSlideBorder.search( tokens[gapFront] )
                 frontStop = front
-                if text.tokens[back].link is None:
+                if link[back] is None:
                     while (
                             front is not None and
                             back is not None and
-                            text.tokens[front].link is not None and
-                            text.tokens[front].token == text.tokens[back].token
+                            link[front] is not None and
+                            ids[front] == ids[back]
                             ):
                         if front is not None:
                             # Stop at line break
-                            if regExpSlideStop.search( text.tokens[front].token ) is True:
+                            if regExpSlideStop.search( tokens[front] ) is True:
                                 frontStop = front
                                 break
 
 # TODO: does this work? (comparison of re.match objects)
                             # Stop at first word border (blank/word or word/blank)
-                            if regExpSlideBorder.search( text.tokens[front].token ) != gapFrontBlankTest:
+                            if regExpSlideBorder.search( tokens[front] ) != gapFrontBlankTest:
                                 frontStop = front
-                        front = text.tokens[front].prev
-                        back = text.tokens[back].prev
+                        front = prev[front]
+                        back = prev[back]
 
                 # Actually slide up to stop
-                front = text.tokens[gapFront].prev
+                front = prev[gapFront]
                 back = gapBack
                 while (
                         front is not None and
                         back is not None and
                         front != frontStop and
-                        text.tokens[front].link is not None and
-                        text.tokens[back].link is None and
-                        text.tokens[front].token == text.tokens[back].token
+                        link[front] is not None and
+                        link[back] is None and
+                        ids[front] == ids[back]
                         ):
-                    text.tokens[back].link = text.tokens[front].link
-                    textLinked.tokens[ text.tokens[back].link ].link = back
-                    text.tokens[front].link = None
+                    link[back] = link[front]
+                    linkedLink[ link[back] ] = back
+                    link[front] = None
 
-                    front = text.tokens[front].prev
-                    back = text.tokens[back].prev
+                    front = prev[front]
+                    back = prev[back]
                 gapStart = None
-            i = text.tokens[i].next
+            i = next[i]
 
 
     ##
@@ -714,16 +764,43 @@ class WikEdDiff:
                 recursionLevel=0
             ):
 
+        # Repeated and recursive diffs are run from an explicit stack instead of the call stack,
+        # every region yields the arguments of its sub-diffs in the order they have to be run
+        stack = [ self.calculateDiffRegion( level, recurse, repeating, newStart, oldStart, up, recursionLevel ) ]
+        while len(stack) > 0:
+            subDiff = next( stack[-1], None )
+            if subDiff is None:
+                stack.pop()
+            else:
+                stack.append( self.calculateDiffRegion( level, recurse, *subDiff ) )
+
+
+    ##
+    ## Calculate diff information for a region, see calculateDiff().
+    ## Generator that yields (repeating, newStart, oldStart, up, recursionLevel)
+    ## for each repeated or recursive diff, which must be run to completion
+    ## before the region continues.
+    ##
+    ## @param string level Split level
+    ## @param bool recurse Enable recursion
+    ## @param bool repeating Currently repeating with empty symbol table
+    ## @param int newStart, oldStart Text object tokens indices
+    ## @param bool up Parse tokens upwards
+    ## @param int recursionLevel Recursion level
+    ##
+    def calculateDiffRegion( self, level, recurse, repeating, newStart, oldStart, up, recursionLevel ):
+
         # Set defaults
         if newStart is None:
             newStart=self.newText.first
         if oldStart is None:
             oldStart=self.oldText.first
 
-        # Start timers
-        if self.config.timer is True and repeating is False and recursionLevel == 0:
-            self.time( level )
-        if self.config.timer is True and repeating is False:
+        # Start timers, not for repeated diffs
+        timer = self.config.timer is True and repeating is False
+        if timer is True:
+            if recursionLevel == 0:
+                self.time( level )
             self.time( level + str(recursionLevel) )
 
         # Get object symbols table and linked region borders
@@ -734,7 +811,7 @@ class WikEdDiff:
 
         # Create empty local symbols table and linked region borders arrays
         else:
-            symbols = Symbols(token=[], hashTable={}, linked=False)
+            symbols = Symbols(hashTable={}, newCount=[], oldCount=[], newToken=[], oldToken=[], linked=False)
             bordersDown = []
             bordersUp = []
 
@@ -742,6 +819,33 @@ class WikEdDiff:
         bordersUpNext = []
         bordersDownNext = []
 
+        # Bind token lists, symbol table arrays and regExps used in the loops
+        newTokens = self.newText.tokens
+        newIds = self.newText.ids
+        newPrev = self.newText.prev
+        newNext = self.newText.next
+        newLink = self.newText.link
+        newUnique = self.newText.unique
+        oldIds = self.oldText.ids
+        oldPrev = self.oldText.prev
+        oldNext = self.oldText.next
+        oldLink = self.oldText.link
+        oldUnique = self.oldText.unique
+        if up is False:
+            newStep = newNext
+            oldStep = oldNext
+        else:
+            newStep = newPrev
+            oldStep = oldPrev
+        blankChars = self.config.blankChars
+        wordFinders = (self.config.regExp.countWords.finditer, self.config.regExp.countChunks.finditer)
+        hashTable = symbols.hashTable
+        hashTableGet = hashTable.get
+        symbolNewCount = symbols.newCount
+        symbolOldCount = symbols.oldCount
+        symbolNewToken = symbols.newToken
+        symbolOldToken = symbols.oldToken
+
         ##
         ## Pass 1: parse new text into symbol table.
         ##
@@ -749,33 +853,28 @@ class WikEdDiff:
         # Cycle through new text tokens list
         i = newStart
         while i is not None:
-            if self.newText.tokens[i].link is None:
-                # Add new entry to symbol table
-                token = self.newText.tokens[i].token
-                if token not in symbols.hashTable:
-                    symbols.hashTable[token] = len(symbols.token)
-                    symbols.token.append( Symbol(
-                            newCount=1,
-                            oldCount=0,
-                            newToken=i,
-                            oldToken=None
-                    ) )
+            if newLink[i] is None:
+                # Add new entry to symbol table, keyed by token id
+                tokenId = newIds[i]
+                hashToArray = hashTableGet(tokenId)
+                if hashToArray is None:
+                    hashTable[tokenId] = len(symbolNewCount)
+                    symbolNewCount.append(1)
+                    symbolOldCount.append(0)
+                    symbolNewToken.append(i)
+                    symbolOldToken.append(None)
 
                 # Or update existing entry
                 else:
                     # Increment token counter for new text
-                    hashToArray = symbols.hashTable[token]
-                    symbols.token[hashToArray].newCount += 1
+                    symbolNewCount[hashToArray] += 1
 
             # Stop after gap if recursing
             elif recursionLevel > 0:
                 break
 
             # Get next token
-            if up is False:
-                i = self.newText.tokens[i].next
-            else:
-                i = self.newText.tokens[i].prev
+            i = newStep[i]
 
         ##
         ## Pass 2: parse old text into symbol table.
@@ -784,94 +883,63 @@ class WikEdDiff:
         # Cycle through old text tokens list
         j = oldStart
         while j is not None:
-            if self.oldText.tokens[j].link is None:
-                # Add new entry to symbol table
-                token = self.oldText.tokens[j].token
-                if token not in symbols.hashTable:
-                    symbols.hashTable[token] = len(symbols.token)
-                    symbols.token.append( Symbol(
-                            newCount=0,
-                            oldCount=1,
-                            newToken=None,
-                            oldToken=j
-                    ) )
+            if oldLink[j] is None:
+                # Add new entry to symbol table, keyed by token id
+                tokenId = oldIds[j]
+                hashToArray = hashTableGet(tokenId)
+                if hashToArray is None:
+                    hashTable[tokenId] = len(symbolNewCount)
+                    symbolNewCount.append(0)
+                    symbolOldCount.append(1)
+                    symbolNewToken.append(None)
+                    symbolOldToken.append(j)
 
                 # Or update existing entry
                 else:
                     # Increment token counter for old text
-                    hashToArray = symbols.hashTable[token]
-                    symbols.token[hashToArray].oldCount += 1
+                    symbolOldCount[hashToArray] += 1
 
                     # Add token number for old text
-                    symbols.token[hashToArray].oldToken = j
+                    symbolOldToken[hashToArray] = j
 
             # Stop after gap if recursing
             elif recursionLevel > 0:
                 break
 
             # Get next token
-            if up is False:
-                j = self.oldText.tokens[j].next
-            else:
-                j = self.oldText.tokens[j].prev
+            j = oldStep[j]
 
         ##
         ## Pass 3: connect unique tokens.
         ##
 
-        # Cycle through symbol array
-        for symbolToken in symbols.token:
-            # Find tokens in the symbol table that occur only once in both versions
-            if symbolToken.newCount == 1 and symbolToken.oldCount == 1:
-                newToken = symbolToken.newToken
-                oldToken = symbolToken.oldToken
-                newTokenObj = self.newText.tokens[newToken]
-                oldTokenObj = self.oldText.tokens[oldToken]
+        # Unique words are only detected for the full text, without running regExps at character level
+        checkUnique = recursionLevel == 0
+        charLevel = level == 'character'
 
+        # Cycle through symbol array, walking the parallel symbol lists together
+        for newCount, oldCount, newToken, oldToken in zip( symbolNewCount, symbolOldCount, symbolNewToken, symbolOldToken ):
+            # Find tokens in the symbol table that occur only once in both versions
+            if newCount == 1 and oldCount == 1:
                 # Connect from new to old and from old to new
-                if newTokenObj.link is None:
-                    # Do not use spaces as unique markers
-                    if self.config.regExp.blankOnlyToken.search( newTokenObj.token ):
+                if newLink[newToken] is None:
+                    # Do not use spaces as unique markers, test first char before testing all chars
+                    token = newTokens[newToken]
+                    if (token != '' and token[0] not in blankChars) or not blankChars.issuperset( token ):
                         # Link new and old tokens
-                        newTokenObj.link = oldToken
-                        oldTokenObj.link = newToken
+                        newLink[newToken] = oldToken
+                        oldLink[oldToken] = newToken
                         symbols.linked = True
 
                         # Save linked region borders
-                        bordersDown.append( [newToken, oldToken] )
-                        bordersUp.append( [newToken, oldToken] )
-
-                        # Check if token contains unique word
-                        if recursionLevel == 0:
-                            unique = False
-                            if level == 'character':
-                                unique = True
-                            else:
-                                token = newTokenObj.token
-                                wordsGen = itertools.chain( self.config.regExp.countWords.finditer(token),
-                                                            self.config.regExp.countChunks.finditer(token) )
-                                words = [match.group() for match in wordsGen]
-
-                                # Unique if longer than min block length
-                                if len(words) >= self.config.blockMinLength:
-                                    unique = True
-
-                                # Unique if it contains at least one unique word
-                                else:
-                                    for word in words:
-                                        if (
-                                                word in self.oldText.words and
-                                                word in self.newText.words and
-                                                self.oldText.words[word] == 1 and
-                                                self.newText.words[word] == 1
-                                                ):
-                                            unique = True
-                                            break
-
-                            # Set unique
-                            if unique is True:
-                                newTokenObj.unique = True
-                                oldTokenObj.unique = True
+                        bordersDown.append( (newToken, oldToken) )
+                        bordersUp.append( (newToken, oldToken) )
+
+                        # Check if token contains unique word, every char is unique at character level
+                        if checkUnique is True:
+                            if charLevel is True or self.containsUniqueWord( token, wordFinders ) is True:
+                                newUnique[newToken] = 1
+                                oldUnique[oldToken] = 1
 
         # Continue passes only if unique tokens have been linked previously
         if symbols.linked is True:
@@ -880,79 +948,13 @@ class WikEdDiff:
             ## Pass 4: connect adjacent identical tokens downwards.
             ##
 
-            # Cycle through list of linked new text tokens
-            for border in bordersDown:
-                i = border[0]
-                j = border[1]
-
-                # Next down
-                iMatch = i
-                jMatch = j
-                i = self.newText.tokens[i].next
-                j = self.oldText.tokens[j].next
-
-                # Cycle through new text list gap region downwards
-                while (
-                        i is not None and
-                        j is not None and
-                        self.newText.tokens[i].link is None and
-                        self.oldText.tokens[j].link is None
-                        ):
-
-                    # Connect if same token
-                    if self.newText.tokens[i].token == self.oldText.tokens[j].token:
-                        self.newText.tokens[i].link = j
-                        self.oldText.tokens[j].link = i
-
-                    # Not a match yet, maybe in next refinement level
-                    else:
-                        bordersDownNext.append( [iMatch, jMatch] )
-                        break
-
-                    # Next token down
-                    iMatch = i
-                    jMatch = j
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+            self.linkAdjacent( bordersDown, bordersDownNext, False )
 
             ##
             ## Pass 5: connect adjacent identical tokens upwards.
             ##
 
-            # Cycle through list of connected new text tokens
-            for border in bordersUp:
-                i = border[0]
-                j = border[1]
-
-                # Next up
-                iMatch = i
-                jMatch = j
-                i = self.newText.tokens[i].prev
-                j = self.oldText.tokens[j].prev
-
-                # Cycle through new text gap region upwards
-                while (
-                        i is not None and
-                        j is not None and
-                        self.newText.tokens[i].link is None and
-                        self.oldText.tokens[j].link is None
-                        ):
-
-                    # Connect if same token
-                    if self.newText.tokens[i].token == self.oldText.tokens[j].token:
-                        self.newText.tokens[i].link = j
-                        self.oldText.tokens[j].link = i
-
-                    # Not a match yet, maybe in next refinement level
-                    else:
-                        bordersUpNext.append( [iMatch, jMatch] )
-                        break
-
-                    # Next token up
-                    iMatch = i
-                    jMatch = j
-                    i = self.newText.tokens[i].prev
-                    j = self.oldText.tokens[j].prev
+            self.linkAdjacent( bordersUp, bordersUpNext, True )
 
             ##
             ## Connect adjacent identical tokens downwards from text start.
@@ -972,18 +974,18 @@ class WikEdDiff:
                 while (
                         i is not None and
                         j is not None and
-                        self.newText.tokens[i].link is None and
-                        self.oldText.tokens[j].link is None and
-                        self.newText.tokens[i].token == self.oldText.tokens[j].token
+                        newLink[i] is None and
+                        oldLink[j] is None and
+                        newIds[i] == oldIds[j]
                         ):
-                    self.newText.tokens[i].link = j
-                    self.oldText.tokens[j].link = i
+                    newLink[i] = j
+                    oldLink[j] = i
                     iMatch = i
                     jMatch = j
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+                    i = newNext[i]
+                    j = oldNext[j]
                 if iMatch is not None:
-                    bordersDownNext.append( [iMatch, jMatch] )
+                    bordersDownNext.append( (iMatch, jMatch) )
 
                 # From end
                 i = self.newText.last
@@ -996,20 +998,22 @@ class WikEdDiff:
                 while (
                         i is not None and
                         j is not None and
-                        self.newText.tokens[i].link is None and
-                        self.oldText.tokens[j].link is None and
-                        self.newText.tokens[i].token == self.oldText.tokens[j].token
+                        newLink[i] is None and
+                        oldLink[j] is None and
+                        newIds[i] == oldIds[j]
                         ):
-                    self.newText.tokens[i].link = j
-                    self.oldText.tokens[j].link = i
+                    newLink[i] = j
+                    oldLink[j] = i
                     iMatch = i
                     jMatch = j
-                    i = self.newText.tokens[i].prev
-                    j = self.oldText.tokens[j].prev
+                    i = newPrev[i]
+                    j = oldPrev[j]
                 if iMatch is not None:
-                    bordersUpNext.append( [iMatch, jMatch] )
+                    bordersUpNext.append( (iMatch, jMatch) )
 
             # Save updated linked region borders to object
+            # Borders are unique without dedup: every border is the last token linked by one walk,
+            # and walks stop at already linked tokens
             if recursionLevel == 0 and repeating is False:
                 self.bordersDown = bordersDownNext
                 self.bordersUp = bordersUpNext
@@ -1027,7 +1031,7 @@ class WikEdDiff:
 
             if repeating is False and self.config.repeatedDiff is True:
                 repeat = True
-                self.calculateDiff( level, recurse, repeat, newStart, oldStart, up, recursionLevel )
+                yield ( repeat, newStart, oldStart, up, recursionLevel )
 
             ##
             ## Refine by recursively diffing not linked regions with new symbol table.
@@ -1046,23 +1050,22 @@ class WikEdDiff:
 
                 # Cycle through list of linked region borders
                 for border in bordersDownNext:
-                    i = border[0]
-                    j = border[1]
+                    i, j = border
 
                     # Next token down
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+                    i = newNext[i]
+                    j = oldNext[j]
 
                     # Start recursion at first gap token pair
                     if (
                             i is not None and
                             j is not None and
-                            self.newText.tokens[i].link is None and
-                            self.oldText.tokens[j].link is None
+                            newLink[i] is None and
+                            oldLink[j] is None
                             ):
                         repeat = False
                         dirUp = False
-                        self.calculateDiff( level, recurse, repeat, i, j, dirUp, recursionLevel + 1 )
+                        yield ( repeat, i, j, dirUp, recursionLevel + 1 )
 
                 ##
                 ## Recursively diff gap upwards.
@@ -1070,31 +1073,121 @@ class WikEdDiff:
 
                 # Cycle through list of linked region borders
                 for border in bordersUpNext:
-                    i = border[0]
-                    j = border[1]
+                    i, j = border
 
                     # Next token up
-                    i = self.newText.tokens[i].prev
-                    j = self.oldText.tokens[j].prev
+                    i = newPrev[i]
+                    j = oldPrev[j]
 
                     # Start recursion at first gap token pair
                     if (
                             i is not None and
                             j is not None and
-                            self.newText.tokens[i].link is None and
-                            self.oldText.tokens[j].link is None
+                            newLink[i] is None and
+                            oldLink[j] is None
                             ):
                         repeat = False
                         dirUp = True
-                        self.calculateDiff( level, recurse, repeat, i, j, dirUp, recursionLevel + 1 )
+                        yield ( repeat, i, j, dirUp, recursionLevel + 1 )
 
         # Stop timers
-        if self.config.timer is True and repeating is False:
+        if timer is True:
             self.recursionTimer.setdefault(recursionLevel, 0.0)
             self.recursionTimer[recursionLevel] += self.timeEnd( level + str(recursionLevel), True )
-        if self.config.timer is True and repeating is False and recursionLevel == 0:
-            self.timeRecursionEnd( level )
-            self.timeEnd( level )
+            if recursionLevel == 0:
+                self.timeRecursionEnd( level )
+                self.timeEnd( level )
+
+
+    ##
+    ## Check if token contains a unique word: it is unique if it is longer than
+    ## min block length (counted in words and chunks) or if it contains at least
+    ## one word or chunk that occurs only once in both versions.
+    ## Single scan that stops at the first hit.
+    ##
+    ## @param string token Token text
+    ## @param array wordFinders Bound finditer methods of the countWords and countChunks regExps
+    ## @param[in] frozenset uniqueWords Words and chunks unique in both versions
+    ## @return bool True if token contains unique word
+    ##
+    def containsUniqueWord( self, token, wordFinders ):
+
+        blockMinLength = self.config.blockMinLength
+        uniqueWords = self.uniqueWords
+
+        # Keep the old zero-minimum behaviour: any token counts as unique
+        if blockMinLength <= 0:
+            return True
+
+        # Count words and chunks
+        words = 0
+        for finditer in wordFinders:
+            for regExpMatch in finditer(token):
+                # Unique if longer than min block length
+                words += 1
+                if words >= blockMinLength:
+                    return True
+
+                # Unique if it contains at least one unique word
+                if regExpMatch.group() in uniqueWords:
+                    return True
+
+        return False
+
+
+    ##
+    ## Connect adjacent identical tokens from linked region borders,
+    ## used for pass 4 (downwards) and pass 5 (upwards) of calculateDiff.
+    ##
+    ## @param array borders Linked region borders to start from
+    ## @param[out] array bordersNext Updated linked region borders
+    ## @param bool up Walk upwards instead of downwards
+    ## @param[in/out] WikEdDiffText newText, oldText Text object, tokens list link property
+    ##
+    def linkAdjacent( self, borders, bordersNext, up ):
+
+        newIds = self.newText.ids
+        newLink = self.newText.link
+        oldIds = self.oldText.ids
+        oldLink = self.oldText.link
+        if up is False:
+            newStep = self.newText.next
+            oldStep = self.oldText.next
+        else:
+            newStep = self.newText.prev
+            oldStep = self.oldText.prev
+
+        # Cycle through list of linked new text tokens
+        # Borders are walked in order: a walk stops at tokens linked by earlier walks
+        for iMatch, jMatch in borders:
+
+            # Next down or up
+            i = newStep[iMatch]
+            j = oldStep[jMatch]
+
+            # Cycle through new text gap region downwards or upwards
+            while (
+                    i is not None and
+                    j is not None and
+                    newLink[i] is None and
+                    oldLink[j] is None
+                    ):
+
+                # Connect if same token
+                if newIds[i] == oldIds[j]:
+                    newLink[i] = j
+                    oldLink[j] = i
+
+                # Not a match yet, maybe in next refinement level
+                else:
+                    bordersNext.append( (iMatch, jMatch) )
+                    break
+
+                # Next token down or up
+                iMatch = i
+                jMatch = j
+                i = newStep[i]
+                j = oldStep[j]
 
 
     ##
@@ -1164,6 +1257,9 @@ class WikEdDiff:
             if self.config.timer is True:
                 self.timeEnd( 'total unlinking' )
 
+        # Free memory
+        self.blockWords.clear()
+
         # Collect deletion ('-') blocks from old text
         self.getDelBlocks()
 
@@ -1173,6 +1269,10 @@ class WikEdDiff:
         # Collect insertion ('+') blocks from new text
         self.getInsBlocks()
 
+        # Sort '-' and '+' blocks in and update groups
+        # Block sort keys are unique, so a single sort gives the same order as sorting after each step
+        self.sortBlocks()
+
         # Set group numbers of '+' blocks
         self.setInsGroups()
 
@@ -1181,7 +1281,7 @@ class WikEdDiff:
 
         # Debug log
         if self.config.timer is True or self.config.debug is True:
-            logger.debug( 'Unlink count: {}'.format(unlinkCount) )
+            logger.debug( 'Unlink count: %s', unlinkCount )
         if self.config.debug is True:
             self.debugGroups( 'Groups' )
             self.debugBlocks( 'Blocks' )
@@ -1203,42 +1303,58 @@ class WikEdDiff:
         # Clear blocks array
         blocks.clear()
 
+        # Bind token lists
+        blockWords = self.blockWords
+        newNext = self.newText.next
+        newUnique = self.newText.unique
+        oldTokens = self.oldText.tokens
+        oldNext = self.oldText.next
+        oldLink = self.oldText.link
+        newNumbers = self.newText.number
+        oldNumbers = self.oldText.number
+
         # Cycle through old text to find connected (linked, matched) blocks
         j = self.oldText.first
         i = None
         while j is not None:
             # Skip '-' blocks
-            while j is not None and self.oldText.tokens[j].link is None:
-                j = self.oldText.tokens[j].next
+            while j is not None and oldLink[j] is None:
+                j = oldNext[j]
 
             # Get '=' block
             if j is not None:
-                i = self.oldText.tokens[j].link
+                i = oldLink[j]
                 iStart = i
                 jStart = j
 
                 # Detect matching blocks ('=')
-                count = 0
                 unique = False
-                text = ''
-                while i is not None and j is not None and self.oldText.tokens[j].link == i:
-                    text += self.oldText.tokens[j].token
-                    count += 1
-                    if self.newText.tokens[i].unique is True:
+                tokens = []
+                while i is not None and j is not None and oldLink[j] == i:
+                    tokens.append( oldTokens[j] )
+                    if newUnique[i]:
                         unique = True
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+                    i = newNext[i]
+                    j = oldNext[j]
+                count = len(tokens)
+                text = ''.join(tokens)
+
+                # Count words, blocks not affected by unlinking keep their text
+                words = blockWords.get(text)
+                if words is None:
+                    words = self.wordCount( text )
+                    blockWords[text] = words
 
                 # Save old text '=' block
                 blocks.append( Block(
                         oldBlock  = len(blocks),
                         newBlock  = None,
-                        oldNumber = self.oldText.tokens[jStart].number,
-                        newNumber = self.newText.tokens[iStart].number,
+                        oldNumber = oldNumbers[jStart],
+                        newNumber = newNumbers[iStart],
                         oldStart  = jStart,
                         count     = count,
                         unique    = unique,
-                        words     = self.wordCount( text ),
+                        words     = words,
                         chars     = len(text),
                         type      = '=',
                         section   = None,
@@ -1249,7 +1365,7 @@ class WikEdDiff:
                     ) )
 
         # Sort blocks by new text token number
-        blocks.sort(key=lambda block: block.newNumber)
+        blocks.sort(key=attrgetter('newNumber'))
 
         # Number blocks in new text order
         for i, block in enumerate(blocks):
@@ -1277,23 +1393,30 @@ class WikEdDiff:
         # Clear sections array
         sections.clear()
 
+        # Get minimal old number of all blocks to the right of each block
+        oldNumbers = [block.oldNumber for block in blocks]
+        oldMinRight = [None] * len(blocks)
+        oldMin = None
+        for block in range(len(blocks) - 1, -1, -1):
+            oldMinRight[block] = oldMin
+            if oldMin is None or oldNumbers[block] < oldMin:
+                oldMin = oldNumbers[block]
+
         # Cycle through blocks
         block = 0
         while block < len(blocks):
             sectionStart = block
             sectionEnd = block
 
-            oldMax = blocks[sectionStart].oldNumber
-            sectionOldMax = oldMax
-
-            # Check right
-            for j in range(sectionStart + 1, len(blocks)):
-                # Check for crossing over to the left
-                if blocks[j].oldNumber > oldMax:
-                    oldMax = blocks[j].oldNumber
-                elif blocks[j].oldNumber < sectionOldMax:
-                    sectionEnd = j
-                    sectionOldMax = oldMax
+            # Check right: extend section while a block further right crosses over to the left
+            sectionOldMax = oldNumbers[sectionStart]
+            while (
+                    oldMinRight[sectionEnd] is not None and
+                    oldMinRight[sectionEnd] < sectionOldMax
+                    ):
+                sectionEnd += 1
+                if oldNumbers[sectionEnd] > sectionOldMax:
+                    sectionOldMax = oldNumbers[sectionEnd]
 
             # Save crossing sections
             if sectionEnd > sectionStart:
@@ -1337,28 +1460,31 @@ class WikEdDiff:
         while block < len(blocks):
             groupStart = block
             groupEnd = block
-            oldBlock = blocks[groupStart].oldBlock
+            blockData = blocks[groupStart]
+            oldBlock = blockData.oldBlock
 
-            # Get word and char count of block
-            words = self.wordCount( blocks[block].text )
+            # Get word and char count of block, words have been counted in getSameBlocks()
+            words = blockData.words
             maxWords = words
-            unique = blocks[block].unique
-            chars = blocks[block].chars
+            unique = blockData.unique
+            chars = blockData.chars
 
             # Check right
             for i in range(groupEnd + 1, len(blocks)):
+                blockData = blocks[i]
+
                 # Check for crossing over to the left
-                if blocks[i].oldBlock != oldBlock + 1:
+                if blockData.oldBlock != oldBlock + 1:
                     break
-                oldBlock = blocks[i].oldBlock
+                oldBlock = blockData.oldBlock
 
                 # Get word and char count of block
-                if blocks[i].words > maxWords:
-                    maxWords = blocks[i].words
-                if blocks[i].unique is True:
+                if blockData.words > maxWords:
+                    maxWords = blockData.words
+                if blockData.unique is True:
                     unique = True
-                words += blocks[i].words
-                chars += blocks[i].chars
+                words += blockData.words
+                chars += blockData.chars
                 groupEnd = i
 
             # Save crossing group
@@ -1422,22 +1548,11 @@ class WikEdDiff:
             groupStart = blocks[blockStart].group
             groupEnd = blocks[blockEnd].group
 
-            # Recusively find path of groups in increasing old group order with longest char length
-            cache = {}
-            maxChars = 0
-            maxPath = None
-
-            # Start at each group of section
-            for i in range(groupStart, groupEnd + 1):
-                pathObj = self.findMaxPath( i, groupEnd, cache )
-                if pathObj.chars > maxChars:
-                    maxPath = pathObj.path
-                    maxChars = pathObj.chars
+            # Find path of groups in increasing old group order with longest char length
+            maxPath = self.findMaxPath( groupStart, groupEnd )
 
             # Mark fixed groups
-# TODO simplify
-            for i in range(len(maxPath)):
-                group = maxPath[i]
+            for group in maxPath:
                 groups[group].fixed = True
 
                 # Mark fixed blocks
@@ -1449,51 +1564,58 @@ class WikEdDiff:
 
 
     ##
-    ## Recusively find path of groups in increasing old group order with longest char length.
+    ## Find path of groups in increasing old group order with longest char length.
+    ## Bottom-up over the groups of a section: the longest path from each start
+    ## group is built from the already known longest paths of the following groups.
     ##
-    ## @param int start Path start group
+    ## @param int groupStart Path first group
     ## @param int groupEnd Path last group
-    ## @param array cache Cache object, contains returnObj for start
-    ## @return array returnObj Contains path and char length
+    ## @return array Path of group indices
     ##
-    def findMaxPath( self, start, groupEnd, cache ):
+    def findMaxPath( self, groupStart, groupEnd ):
 
         groups = self.groups
 
-        # Find longest sub-path
-        maxChars = 0
-        oldNumber = groups[start].oldNumber
-        returnObj = CacheEntry( path=[], chars=0 )
-        for i in range(start + 1, groupEnd + 1):
-            # Only in increasing old group order
-            if groups[i].oldNumber < oldNumber:
-                continue
-
-            # Get longest sub-path from cache (deep copy)
-            if i in cache:
-# TODO deep vs. shallow
-#                pathObj = CacheEntry( path=cache[i].path.slice(), chars=cache[i].chars )
-                pathObj = CacheEntry( path=copy.deepcopy(cache[i].path), chars=cache[i].chars )
-            # Get longest sub-path by recursion
-            else:
-                pathObj = self.findMaxPath( i, groupEnd, cache )
+        # Old numbers and char lengths of section groups
+        count = groupEnd - groupStart + 1
+        oldNumbers = [groups[group].oldNumber for group in range(groupStart, groupEnd + 1)]
+        chars = [groups[group].chars for group in range(groupStart, groupEnd + 1)]
 
-            # Select longest sub-path
-            if pathObj.chars > maxChars:
-                maxChars = pathObj.chars
-                returnObj = pathObj
+        # Longest path char length and next path group for each start group
+        pathChars = [0] * count
+        pathNext = [None] * count
 
-        # Add current start to path
-        returnObj.path.insert( 0, start )
-        returnObj.chars += groups[start].chars
+        # Cycle through start groups from the end
+        for start in range(count - 1, -1, -1):
+            # Find longest sub-path
+            maxChars = 0
+            maxNext = None
+            oldNumber = oldNumbers[start]
+            for i in range(start + 1, count):
+                # Only in increasing old group order
+                if oldNumbers[i] >= oldNumber and pathChars[i] > maxChars:
+                    maxChars = pathChars[i]
+                    maxNext = i
+
+            # Add current start to path
+            pathChars[start] = maxChars + chars[start]
+            pathNext[start] = maxNext
+
+        # Select longest path over all start groups
+        maxChars = 0
+        start = None
+        for i in range(count):
+            if pathChars[i] > maxChars:
+                maxChars = pathChars[i]
+                start = i
 
-        # Save path to cache (deep copy)
-        if start not in cache:
-# TODO deep vs. shallow
-#            cache.append( CacheEntry( path=returnObj.path.slice(), chars=returnObj.chars ) )
-            cache[start] = CacheEntry( path=copy.deepcopy(returnObj.path), chars=returnObj.chars )
+        # Collect path groups
+        path = []
+        while start is not None:
+            path.append( groupStart + start )
+            start = pathNext[start]
 
-        return returnObj
+        return path
 
 
     ##
@@ -1559,13 +1681,17 @@ class WikEdDiff:
     ##
     def unlinkSingleBlock( self, block ):
 
+        newLink = self.newText.link
+        oldLink = self.oldText.link
+        oldNext = self.oldText.next
+
         # Cycle through old text
         j = block.oldStart
         for count in range(block.count):
             # Unlink tokens
-            self.newText.tokens[ self.oldText.tokens[j].link ].link = None
-            self.oldText.tokens[j].link = None
-            j = self.oldText.tokens[j].next
+            newLink[ oldLink[j] ] = None
+            oldLink[j] = None
+            j = oldNext[j]
 
 
     ##
@@ -1580,46 +1706,30 @@ class WikEdDiff:
             self.time( 'getDelBlocks' )
 
         blocks = self.blocks
+        oldNumbers = self.oldText.number
 
-        # Cycle through old text to find connected (linked, matched) blocks
-        j = self.oldText.first
-        i = None
-        while j is not None:
-            # Collect '-' blocks
-            oldStart = j
-            count = 0
-            text = ''
-            while j is not None and self.oldText.tokens[j].link is None:
-                count += 1
-                text += self.oldText.tokens[j].token
-                j = self.oldText.tokens[j].next
+        # Cycle through runs of unlinked old text tokens
+        for oldStart, tokens in self.oldText.getUnlinkedRuns():
+            text = ''.join(tokens)
 
             # Save old text '-' block
-            if count != 0:
-                blocks.append( Block(
-                            oldBlock  = None,
-                            newBlock  = None,
-                            oldNumber = self.oldText.tokens[oldStart].number,
-                            newNumber = None,
-                            oldStart  = oldStart,
-                            count     = count,
-                            unique    = False,
-                            words     = 0,
-                            chars     = len(text),
-                            type      = '-',
-                            section   = None,
-                            group     = None,
-                            fixed     = False,
-                            moved     = None,
-                            text      = text
-                    ) )
-
-            # Skip '=' blocks
-            if j is not None:
-                i = self.oldText.tokens[j].link
-                while i is not None and j is not None and self.oldText.tokens[j].link == i:
-                    i = self.newText.tokens[i].next
-                    j = self.oldText.tokens[j].next
+            blocks.append( Block(
+                        oldBlock  = None,
+                        newBlock  = None,
+                        oldNumber = oldNumbers[oldStart],
+                        newNumber = None,
+                        oldStart  = oldStart,
+                        count     = len(tokens),
+                        unique    = False,
+                        words     = 0,
+                        chars     = len(text),
+                        type      = '-',
+                        section   = None,
+                        group     = None,
+                        fixed     = False,
+                        moved     = None,
+                        text      = text
+                ) )
 
         if self.config.timer is True:
             self.timeEnd( 'getDelBlocks' )
@@ -1649,7 +1759,10 @@ class WikEdDiff:
         groups = self.groups
 
         # Sort shallow copy of blocks by oldNumber
-        blocksOld = sorted(blocks, key=lambda block: block.oldNumber)
+        blocksOld = sorted(blocks, key=attrgetter('oldNumber'))
+
+        # Get closest fixed '=' block before each block in old text order
+        prevFixed = self.getPrevFixed( blocksOld )
 
         # Cycle through blocks in old text order
         for block in range(len(blocksOld)):
@@ -1702,11 +1815,8 @@ class WikEdDiff:
                 refBlock = nextBlock
 
             # Move after closest previous fixed block
-            else:
-                for fixed in range(block, -1, -1):
-                    if blocksOld[fixed].type == '=' and blocksOld[fixed].fixed is True:
-                        refBlock = blocksOld[fixed]
-                        break
+            elif prevFixed[block] is not None:
+                refBlock = prevFixed[block]
 
             # Move before first block
             if refBlock == 0:
@@ -1719,13 +1829,28 @@ class WikEdDiff:
                 delBlock.group = refBlock.group
                 delBlock.fixed = refBlock.fixed
 
-        # Sort '-' blocks in and update groups
-        self.sortBlocks()
-
         if self.config.timer is True:
             self.timeEnd( 'positionDelBlocks' )
 
 
+    ##
+    ## Get closest fixed '=' block to the left of each block, single sweep instead of
+    ## scanning back from every block.
+    ##
+    ## @param array blocksOld Blocks sorted in old text order
+    ## @return array Closest previous fixed '=' block or None for each index of blocksOld
+    ##
+    def getPrevFixed( self, blocksOld ):
+
+        prevFixed = []
+        lastFixed = None
+        for blockData in blocksOld:
+            prevFixed.append( lastFixed )
+            if blockData.type == '=' and blockData.fixed is True:
+                lastFixed = blockData
+        return prevFixed
+
+
     ##
     ## Collect insertion ('+') blocks from new text.
     ##
@@ -1738,46 +1863,30 @@ class WikEdDiff:
             self.time( 'getInsBlocks' )
 
         blocks = self.blocks
+        newNumbers = self.newText.number
 
-        # Cycle through new text to find insertion blocks
-        i = self.newText.first
-        while i is not None:
-
-            # Jump over linked (matched) block
-            while i is not None and self.newText.tokens[i].link is not None:
-                i = self.newText.tokens[i].next
-
-            # Detect insertion blocks ('+')
-            if i is not None:
-                iStart = i
-                count = 0
-                text = ''
-                while i is not None and self.newText.tokens[i].link is None:
-                    count += 1
-                    text += self.newText.tokens[i].token
-                    i = self.newText.tokens[i].next
-
-                # Save new text '+' block
-                blocks.append( Block(
-                        oldBlock  = None,
-                        newBlock  = None,
-                        oldNumber = None,
-                        newNumber = self.newText.tokens[iStart].number,
-                        oldStart  = None,
-                        count     = count,
-                        unique    = False,
-                        words     = 0,
-                        chars     = len(text),
-                        type      = '+',
-                        section   = None,
-                        group     = None,
-                        fixed     = False,
-                        moved     = None,
-                        text      = text
-                ) )
+        # Cycle through runs of unlinked new text tokens
+        for newStart, tokens in self.newText.getUnlinkedRuns():
+            text = ''.join(tokens)
 
-        # Sort '+' blocks in and update groups
-        self.sortBlocks()
+            # Save new text '+' block
+            blocks.append( Block(
+                    oldBlock  = None,
+                    newBlock  = None,
+                    oldNumber = None,
+                    newNumber = newNumbers[newStart],
+                    oldStart  = None,
+                    count     = len(tokens),
+                    unique    = False,
+                    words     = 0,
+                    chars     = len(text),
+                    type      = '+',
+                    section   = None,
+                    group     = None,
+                    fixed     = False,
+                    moved     = None,
+                    text      = text
+            ) )
 
         if self.config.timer is True:
             self.timeEnd( 'getInsBlocks' )
@@ -1794,18 +1903,19 @@ class WikEdDiff:
         blocks = self.blocks
         groups = self.groups
 
-        # Sort by newNumber, then by old number
-        blocks.sort(key=lambda block: (int_or_null(block.newNumber), int_or_null(block.oldNumber)))
+        # Sort by newNumber, then by old number, None as 0
+        blocks.sort(key=lambda block: (block.newNumber or 0, block.oldNumber or 0))
 
         # Cycle through blocks and update groups with new block numbers
         group = 0
-        for block in range(len(blocks)):
-            blockGroup = blocks[block].group
-            if blockGroup is not None and blockGroup < len(groups):
+        groupsLength = len(groups)
+        for block, blockData in enumerate(blocks):
+            blockGroup = blockData.group
+            if blockGroup is not None and blockGroup < groupsLength:
                 if blockGroup != group:
-                    group = blocks[block].group
+                    group = blockGroup
                     groups[group].blockStart = block
-                    groups[group].oldNumber = blocks[block].oldNumber
+                    groups[group].oldNumber = blockData.oldNumber
                 groups[blockGroup].blockEnd = block
 
 
@@ -1824,31 +1934,31 @@ class WikEdDiff:
         groups = self.groups
 
         # Set group numbers of '+' blocks inside existing groups
-        for group in range(len(groups)):
-            fixed = groups[group].fixed
-            for block in range(groups[group].blockStart, groups[group].blockEnd + 1):
-                if blocks[block].group is None:
-                    blocks[block].group = group
-                    blocks[block].fixed = fixed
+        for group, groupData in enumerate(groups):
+            fixed = groupData.fixed
+            for blockData in blocks[groupData.blockStart : groupData.blockEnd + 1]:
+                if blockData.group is None:
+                    blockData.group = group
+                    blockData.fixed = fixed
 
         # Add remaining '+' blocks to new groups
 
         # Cycle through blocks
-        for block in range(len(blocks)):
+        for block, blockData in enumerate(blocks):
             # Skip existing groups
-            if blocks[block].group is None:
-                blocks[block].group = len(groups)
+            if blockData.group is None:
+                blockData.group = len(groups)
 
                 # Save new single-block group
                 groups.append( Group(
-                        oldNumber  = blocks[block].oldNumber,
+                        oldNumber  = blockData.oldNumber,
                         blockStart = block,
                         blockEnd   = block,
-                        unique     = blocks[block].unique,
-                        maxWords   = blocks[block].words,
-                        words      = blocks[block].words,
-                        chars      = blocks[block].chars,
-                        fixed      = blocks[block].fixed,
+                        unique     = blockData.unique,
+                        maxWords   = blockData.words,
+                        words      = blockData.words,
+                        chars      = blockData.chars,
+                        fixed      = blockData.fixed,
                         movedFrom  = None,
                         color      = 0
                 ) )
@@ -1888,20 +1998,21 @@ class WikEdDiff:
         moved = []
         color = 1
 
-        # Make shallow copy of blocks
-        blocksOld = blocks[:]
+        # Sort block numbers by oldNumber, then by newNumber, None as 0
+        # Decorated with the block number, which keeps equal keys in block order
+        sortKeys = sorted([(block.oldNumber or 0, block.newNumber or 0, number) for number, block in enumerate(blocks)])
+        numbersOld = [sortKey[2] for sortKey in sortKeys]
 
-        # Enumerate copy
-        for i, block in enumerate(blocksOld):
-            block.number = i
+        # Make sorted shallow copy of blocks
+        blocksOld = [blocks[number] for number in numbersOld]
 
-        # Sort copy by oldNumber, then by newNumber
-        blocksOld.sort(key=lambda block: (int_or_null(block.oldNumber), int_or_null(block.newNumber)))
+        # Create lookup table: original to sorted (inverse permutation)
+        lookupSorted = [0] * len(numbersOld)
+        for i, number in enumerate(numbersOld):
+            lookupSorted[number] = i
 
-        # Create lookup table: original to sorted
-        lookupSorted = {}
-        for i in range(len(blocksOld)):
-            lookupSorted[ blocksOld[i].number ] = i
+        # Get closest fixed '=' block before each block in old text order
+        prevFixed = self.getPrevFixed( blocksOld )
 
         # Cycle through groups (moved group)
         for moved in range(len(groups)):
@@ -1940,10 +2051,7 @@ class WikEdDiff:
 
             # Find closest fixed block to the left
             else:
-                for fixed in range(lookupSorted[ movedGroup.blockStart ] - 1, -1, -1):
-                    if blocksOld[fixed].type == '=' and blocksOld[fixed].fixed is True:
-                        refBlock = blocksOld[fixed]
-                        break
+                refBlock = prevFixed[ lookupSorted[ movedGroup.blockStart ] ]
 
             # Get position of new mark block
 
@@ -2019,84 +2127,98 @@ class WikEdDiff:
         groups = self.groups
         fragments = []
 
-        # Make shallow copy of groups and sort by blockStart
-        groupsSort = sorted(groups, key=lambda group: group.blockStart)
+        # Fast path without moved groups: no '|' marks and no move brackets
+        if all(groupData.color == 0 for groupData in groups):
+            for groupData in sorted(groups, key=attrgetter('blockStart')):
+                for blockData in blocks[groupData.blockStart : groupData.blockEnd + 1]:
+                    fragments.append( Fragment(
+                            text  = blockData.text,
+                            type  = blockData.type,
+                            color = 0
+                    ) )
 
-        # Cycle through groups
-        for group in range(len(groupsSort)):
-            blockStart = groupsSort[group].blockStart
-            blockEnd = groupsSort[group].blockEnd
-
-            # Add moved block start
-            color = groupsSort[group].color
-            if color != 0:
-                if groupsSort[group].movedFrom < blocks[ blockStart ].group:
-                    type = '(<'
-                else:
-                    type = '(>'
-                fragments.append( Fragment(
-                        text  = '',
-                        type  = type,
-                        color = color
-                ) )
+        else:
+            # Mark texts of moved groups, collected once per group
+            markTexts = {}
 
-            # Cycle through blocks
-            for block in range(blockStart, blockEnd + 1):
-                type = blocks[block].type
+            # Cycle through groups sorted by blockStart
+            for groupData in sorted(groups, key=attrgetter('blockStart')):
+                blockStart = groupData.blockStart
+                blockEnd = groupData.blockEnd
 
-                # Add '=' unchanged text and moved block
-                if type == '=' or type == '-' or type == '+':
+                # Add moved block start
+                color = groupData.color
+                if color != 0:
+                    if groupData.movedFrom < blocks[ blockStart ].group:
+                        type = '(<'
+                    else:
+                        type = '(>'
                     fragments.append( Fragment(
-                            text  = blocks[block].text,
+                            text  = '',
                             type  = type,
                             color = color
                     ) )
 
-                # Add '<' and '>' marks
-                elif type == '|':
-                    movedGroup = groups[ blocks[block].moved ]
-
-                    # Get mark text
-                    markText = ''
-                    for movedBlock in range(movedGroup.blockStart, movedGroup.blockEnd + 1):
-                        if blocks[movedBlock].type == '=' or blocks[movedBlock].type == '-':
-                            markText += blocks[movedBlock].text
-
-                    # Get mark direction
-                    if movedGroup.blockStart < blockStart:
-                        markType = '<'
-                    else:
-                        markType = '>'
-
-                    # Add mark
+                # Cycle through blocks
+                for blockData in blocks[blockStart : blockEnd + 1]:
+                    type = blockData.type
+
+                    # Add '=' unchanged text and moved block
+                    if type == '=' or type == '-' or type == '+':
+                        fragments.append( Fragment(
+                                text  = blockData.text,
+                                type  = type,
+                                color = color
+                        ) )
+
+                    # Add '<' and '>' marks
+                    elif type == '|':
+                        movedGroup = groups[ blockData.moved ]
+
+                        # Get mark text
+                        markText = markTexts.get( blockData.moved )
+                        if markText is None:
+                            markText = ''.join(
+                                    movedBlock.text for movedBlock in blocks[movedGroup.blockStart : movedGroup.blockEnd + 1]
+                                    if movedBlock.type == '=' or movedBlock.type == '-'
+                            )
+                            markTexts[ blockData.moved ] = markText
+
+                        # Get mark direction
+                        if movedGroup.blockStart < blockStart:
+                            markType = '<'
+                        else:
+                            markType = '>'
+
+                        # Add mark
+                        fragments.append( Fragment(
+                                text  = markText,
+                                type  = markType,
+                                color = movedGroup.color
+                        ) )
+
+                # Add moved block end
+                if color != 0:
                     fragments.append( Fragment(
-                            text  = markText,
-                            type  = markType,
-                            color = movedGroup.color
+                            text  = '',
+                            type  = ' )',
+                            color = color
                     ) )
 
-            # Add moved block end
-            if color != 0:
-                fragments.append( Fragment(
-                        text  = '',
-                        type  = ' )',
-                        color = color
-                ) )
-
         # Cycle through fragments, join consecutive fragments of same type (i.e. '-' blocks)
-        fragment = 1
-        while fragment < len(fragments):
+        joined = []
+        for fragment in fragments:
             # Check if joinable
             if (
-                    fragments[fragment].type == fragments[fragment - 1].type and
-                    fragments[fragment].color == fragments[fragment - 1].color and
-                    fragments[fragment].text != '' and fragments[fragment - 1].text != ''
+                    len(joined) > 0 and
+                    fragment.type == joined[-1].type and
+                    fragment.color == joined[-1].color and
+                    fragment.text != '' and joined[-1].text != ''
                     ):
-                # Join and splice
-                fragments[fragment - 1].text += fragments[fragment].text
-                fragments.pop(fragment)
-                fragment -= 1
-            fragment += 1
+                joined[-1].text += fragment.text
+            else:
+                joined.append( fragment )
+        fragments = joined
 
         # Enclose in containers
         fragments.insert( 0, Fragment( text='', type='{', color=0 ) )
@@ -2121,50 +2243,82 @@ class WikEdDiff:
         if len(fragments) == 5:
             return
 
+        # Bind clipping settings and regExps
+        clipBlankLeftMax = self.config.clipBlankLeftMax
+        clipBlankLeftMin = self.config.clipBlankLeftMin
+        clipBlankRightMax = self.config.clipBlankRightMax
+        clipBlankRightMin = self.config.clipBlankRightMin
+        clipCharsLeft = self.config.clipCharsLeft
+        clipCharsRight = self.config.clipCharsRight
+        clipHeadingLeft = self.config.clipHeadingLeft
+        clipHeadingRight = self.config.clipHeadingRight
+        clipLineLeftMax = self.config.clipLineLeftMax
+        clipLineLeftMin = self.config.clipLineLeftMin
+        clipLineRightMax = self.config.clipLineRightMax
+        clipLineRightMin = self.config.clipLineRightMin
+        clipLinesLeftMax = self.config.clipLinesLeftMax
+        clipLinesRightMax = self.config.clipLinesRightMax
+        clipParagraphLeftMax = self.config.clipParagraphLeftMax
+        clipParagraphLeftMin = self.config.clipParagraphLeftMin
+        clipParagraphRightMax = self.config.clipParagraphRightMax
+        clipParagraphRightMin = self.config.clipParagraphRightMin
+        clipSkipChars = self.config.clipSkipChars
+        clipSkipLines = self.config.clipSkipLines
+        regExpClipBlank = self.config.regExp.clipBlank
+        regExpClipHeading = self.config.regExp.clipHeading
+        regExpClipLine = self.config.regExp.clipLine
+        regExpClipOtherNewLines = self.config.regExp.clipOtherNewLines
+        regExpClipParagraph = self.config.regExp.clipParagraph
+        regExpClipTrimBlanksLeft = self.config.regExp.clipTrimBlanksLeft
+        regExpClipTrimBlanksRight = self.config.regExp.clipTrimBlanksRight
+        regExpClipTrimNewLinesLeft = self.config.regExp.clipTrimNewLinesLeft
+        regExpClipTrimNewLinesRight = self.config.regExp.clipTrimNewLinesRight
+
         # Min length for clipping right
-        minRight = self.config.clipHeadingRight
-        if self.config.clipParagraphRightMin < minRight:
-            minRight = self.config.clipParagraphRightMin
-        if self.config.clipLineRightMin < minRight:
-            minRight = self.config.clipLineRightMin
-        if self.config.clipBlankRightMin < minRight:
-            minRight = self.config.clipBlankRightMin
-        if self.config.clipCharsRight < minRight:
-            minRight = self.config.clipCharsRight
+        minRight = min(clipHeadingRight, clipParagraphRightMin, clipLineRightMin, clipBlankRightMin, clipCharsRight)
 
         # Min length for clipping left
-        minLeft = self.config.clipHeadingLeft
-        if self.config.clipParagraphLeftMin < minLeft:
-            minLeft = self.config.clipParagraphLeftMin
-        if self.config.clipLineLeftMin < minLeft:
-            minLeft = self.config.clipLineLeftMin
-        if self.config.clipBlankLeftMin < minLeft:
-            minLeft = self.config.clipBlankLeftMin
-        if self.config.clipCharsLeft < minLeft:
-            minLeft = self.config.clipCharsLeft
+        minLeft = min(clipHeadingLeft, clipParagraphLeftMin, clipLineLeftMin, clipBlankLeftMin, clipCharsLeft)
+
+        # Min length for clipping on either side
+        minClip = min(minRight, minLeft)
+
+        # Clipped fragments list, rebuilt in a single pass instead of inserting in place
+        clipped = []
 
         # Cycle through fragments
-        fragment = -1
-        while fragment + 1 < len(fragments):
-            fragment += 1
+        for fragment in range(len(fragments)):
+            fragmentData = fragments[fragment]
+            clipped.append( fragmentData )
 
             # Skip if not an unmoved and unchanged block
-            type = fragments[fragment].type
-            color = fragments[fragment].color
+            type = fragmentData.type
+            color = fragmentData.color
             if type != '=' or color != 0:
                 continue
 
             # Skip if too short for clipping
-            text = fragments[fragment].text
-            if len(text) < minRight and len(text) < minLeft:
+            text = fragmentData.text
+            if len(text) < minClip:
                 continue
 
             # Get line positions including start and end
             lines = []
             lastIndex = 0
-            for regExpMatch in self.config.regExp.clipLine.finditer(text):
-                lines.append( regExpMatch.start() )
-                lastIndex = regExpMatch.end()
+
+            # Plain '\n' newlines only: find runs of newlines with str.find instead of the regExp
+            if regExpClipOtherNewLines.search(text) is None:
+                pos = text.find('\n')
+                while pos != -1:
+                    lines.append( pos )
+                    lastIndex = pos + 1
+                    while lastIndex < len(text) and text[lastIndex] == '\n':
+                        lastIndex += 1
+                    pos = text.find('\n', lastIndex)
+            else:
+                for regExpMatch in regExpClipLine.finditer(text):
+                    lines.append( regExpMatch.start() )
+                    lastIndex = regExpMatch.end()
             if len(lines) == 0 or lines[0] != 0:
                 lines.insert( 0, 0 )
             if lastIndex != len(text):
@@ -2173,14 +2327,14 @@ class WikEdDiff:
             # Get heading positions
             headings = []
             headingsEnd = []
-            for regExpMatch in self.config.regExp.clipHeading.finditer(text):
+            for regExpMatch in regExpClipHeading.finditer(text):
                 headings.append( regExpMatch.start() )
                 headingsEnd.append( regExpMatch.end() )
 
             # Get paragraph positions including start and end
             paragraphs = []
             lastIndex = 0
-            for regExpMatch in self.config.regExp.clipParagraph.finditer(text):
+            for regExpMatch in regExpClipParagraph.finditer(text):
                 paragraphs.append( regExpMatch.start() )
                 lastIndex = regExpMatch.end()
             if len(paragraphs) == 0 or paragraphs[0] != 0:
@@ -2198,47 +2352,42 @@ class WikEdDiff:
             if fragment != 2:
                 # Maximum lines to search from left
                 rangeLeftMax = len(text)
-                if self.config.clipLinesLeftMax < len(lines):
-                    rangeLeftMax = lines[self.config.clipLinesLeftMax]
+                if clipLinesLeftMax < len(lines):
+                    rangeLeftMax = lines[clipLinesLeftMax]
 
                 # Find first heading from left
                 if rangeLeft is None:
                     for j in range(len(headingsEnd)):
-                        if headingsEnd[j] > self.config.clipHeadingLeft or headingsEnd[j] > rangeLeftMax:
+                        if headingsEnd[j] > clipHeadingLeft or headingsEnd[j] > rangeLeftMax:
                             break
                         rangeLeft = headingsEnd[j]
                         rangeLeftType = 'heading'
                         break
 
-                # Find first paragraph from left
+                # Find first paragraph from left (positions are sorted)
                 if rangeLeft is None:
-                    for j in range(len(paragraphs)):
-                        if (
-                                paragraphs[j] > self.config.clipParagraphLeftMax or
-                                paragraphs[j] > rangeLeftMax
-                                ):
-                            break
-                        if paragraphs[j] > self.config.clipParagraphLeftMin:
-                            rangeLeft = paragraphs[j]
-                            rangeLeftType = 'paragraph'
-                            break
+                    j = bisect_right(paragraphs, clipParagraphLeftMin)
+                    if (
+                            j < len(paragraphs) and
+                            paragraphs[j] <= clipParagraphLeftMax and
+                            paragraphs[j] <= rangeLeftMax
+                            ):
+                        rangeLeft = paragraphs[j]
+                        rangeLeftType = 'paragraph'
 
                 # Find first line break from left
                 if rangeLeft is None:
-                    for j in range(len(lines)):
-                        if lines[j] > self.config.clipLineLeftMax or lines[j] > rangeLeftMax:
-                            break
-                        if lines[j] > self.config.clipLineLeftMin:
-                            rangeLeft = lines[j]
-                            rangeLeftType = 'line'
-                            break
+                    j = bisect_right(lines, clipLineLeftMin)
+                    if j < len(lines) and lines[j] <= clipLineLeftMax and lines[j] <= rangeLeftMax:
+                        rangeLeft = lines[j]
+                        rangeLeftType = 'line'
 
                 # Find first blank from left
                 if rangeLeft is None:
-                    regExpMatch = self.config.regExp.clipBlank.search(text, pos=self.config.clipBlankLeftMin)
+                    regExpMatch = regExpClipBlank.search(text, pos=clipBlankLeftMin)
                     if regExpMatch:
                         if (
-                                regExpMatch.start() < self.config.clipBlankLeftMax and
+                                regExpMatch.start() < clipBlankLeftMax and
                                 regExpMatch.start() < rangeLeftMax
                                 ):
                             rangeLeft = regExpMatch.start()
@@ -2246,8 +2395,8 @@ class WikEdDiff:
 
                 # Fixed number of chars from left
                 if rangeLeft is None:
-                    if self.config.clipCharsLeft < rangeLeftMax:
-                        rangeLeft = self.config.clipCharsLeft
+                    if clipCharsLeft < rangeLeftMax:
+                        rangeLeft = clipCharsLeft
                         rangeLeftType = 'chars'
 
                 # Fixed number of lines from left
@@ -2259,14 +2408,14 @@ class WikEdDiff:
             if fragment != len(fragments) - 3:
                 # Maximum lines to search from right
                 rangeRightMin = 0
-                if len(lines) >= self.config.clipLinesRightMax:
-                    rangeRightMin = lines[len(lines) - self.config.clipLinesRightMax]
+                if len(lines) >= clipLinesRightMax:
+                    rangeRightMin = lines[len(lines) - clipLinesRightMax]
 
                 # Find last heading from right
                 if rangeRight is None:
                     for j in range(len(headings) - 1, -1, -1):
                         if (
-                                headings[j] < len(text) - self.config.clipHeadingRight or
+                                headings[j] < len(text) - clipHeadingRight or
                                 headings[j] < rangeRightMin
                                 ):
                             break
@@ -2274,41 +2423,37 @@ class WikEdDiff:
                         rangeRightType = 'heading'
                         break
 
-                # Find last paragraph from right
+                # Find last paragraph from right (positions are sorted)
                 if rangeRight is None:
-                    for j in range(len(paragraphs) - 1, -1, -1):
-                        if (
-                                paragraphs[j] < len(text) - self.config.clipParagraphRightMax or
-                                paragraphs[j] < rangeRightMin
-                                ):
-                            break
-                        if paragraphs[j] < len(text) - self.config.clipParagraphRightMin:
-                            rangeRight = paragraphs[j]
-                            rangeRightType = 'paragraph'
-                            break
+                    j = bisect_left(paragraphs, len(text) - clipParagraphRightMin) - 1
+                    if (
+                            j >= 0 and
+                            paragraphs[j] >= len(text) - clipParagraphRightMax and
+                            paragraphs[j] >= rangeRightMin
+                            ):
+                        rangeRight = paragraphs[j]
+                        rangeRightType = 'paragraph'
 
                 # Find last line break from right
                 if rangeRight is None:
-                    for j in range(len(lines) - 1, -1, -1):
-                        if (
-                                lines[j] < len(text) - self.config.clipLineRightMax or
-                                lines[j] < rangeRightMin
-                                ):
-                            break
-                        if lines[j] < len(text) - self.config.clipLineRightMin:
-                            rangeRight = lines[j]
-                            rangeRightType = 'line'
-                            break
+                    j = bisect_left(lines, len(text) - clipLineRightMin) - 1
+                    if (
+                            j >= 0 and
+                            lines[j] >= len(text) - clipLineRightMax and
+                            lines[j] >= rangeRightMin
+                            ):
+                        rangeRight = lines[j]
+                        rangeRightType = 'line'
 
                 # Find last blank from right
                 if rangeRight is None:
-                    startPos = len(text) - self.config.clipBlankRightMax
+                    startPos = len(text) - clipBlankRightMax
                     if startPos < rangeRightMin:
                         startPos = rangeRightMin
                     lastPos = None
-                    regExpMatches = self.config.regExp.clipBlank.finditer(text, pos=startPos)
+                    regExpMatches = regExpClipBlank.finditer(text, pos=startPos)
                     for regExpMatch in regExpMatches:
-                        if regExpMatch.start() > len(text) - self.config.clipBlankRightMin:
+                        if regExpMatch.start() > len(text) - clipBlankRightMin:
                             if lastPos is not None:
                                 rangeRight = lastPos
                                 rangeRightType = 'blank'
@@ -2317,8 +2462,8 @@ class WikEdDiff:
 
                 # Fixed number of chars from right
                 if rangeRight is None:
-                    if len(text) - self.config.clipCharsRight > rangeRightMin:
-                        rangeRight = len(text) - self.config.clipCharsRight
+                    if len(text) - clipCharsRight > rangeRightMin:
+                        rangeRight = len(text) - clipCharsRight
                         rangeRightType = 'chars'
 
                 # Fixed number of lines from right
@@ -2334,17 +2479,12 @@ class WikEdDiff:
 
                 # Skip if chars too close
                 skipChars = rangeRight - rangeLeft
-                if skipChars < self.config.clipSkipChars:
+                if skipChars < clipSkipChars:
                     continue
 
                 # Skip if lines too close
-                skipLines = 0
-                for j in range(len(lines)):
-                    if lines[j] > rangeRight or skipLines > self.config.clipSkipLines:
-                        break
-                    if lines[j] > rangeLeft:
-                        skipLines += 1
-                if skipLines < self.config.clipSkipLines:
+                skipLines = bisect_right(lines, rangeRight) - bisect_right(lines, rangeLeft)
+                if skipLines < clipSkipLines:
                     continue
 
             # Skip if nothing to clip
@@ -2357,16 +2497,17 @@ class WikEdDiff:
             if rangeLeft is not None:
                 textLeft = text[ :rangeLeft ]
 
-                # Remove trailing empty lines
-                textLeft = self.config.regExp.clipTrimNewLinesLeft.sub( "", textLeft )
-
-                # Get omission indicators, remove trailing blanks
+                # Get omission indicators, remove trailing blanks and empty lines
                 if rangeLeftType == 'chars':
                     omittedLeft = '~'
-                    textLeft = self.config.regExp.clipTrimBlanksLeft.sub( "", textLeft )
+                    textLeft = regExpClipTrimBlanksLeft.sub( "", textLeft )
                 elif rangeLeftType == 'blank':
                     omittedLeft = ' ~'
-                    textLeft = self.config.regExp.clipTrimBlanksLeft.sub( "", textLeft )
+                    textLeft = regExpClipTrimBlanksLeft.sub( "", textLeft )
+
+                # Remove trailing empty lines (blanks trimming above includes new lines)
+                else:
+                    textLeft = regExpClipTrimNewLinesLeft.sub( "", textLeft )
 
             # Split right text
             textRight = None
@@ -2374,44 +2515,41 @@ class WikEdDiff:
             if rangeRight is not None:
                 textRight = text[ rangeRight: ]
 
-                # Remove leading empty lines
-                textRight = self.config.regExp.clipTrimNewLinesRight.sub( "", textRight )
-
-                # Get omission indicators, remove leading blanks
+                # Get omission indicators, remove leading blanks and empty lines
                 if rangeRightType == 'chars':
                     omittedRight = '~'
-                    textRight = self.config.regExp.clipTrimBlanksRight.sub( "", textRight )
+                    textRight = regExpClipTrimBlanksRight.sub( "", textRight )
                 elif rangeRightType == 'blank':
                     omittedRight = '~ '
-                    textRight = self.config.regExp.clipTrimBlanksRight.sub( "", textRight )
+                    textRight = regExpClipTrimBlanksRight.sub( "", textRight )
+
+                # Remove leading empty lines (blanks trimming above includes new lines)
+                else:
+                    textRight = regExpClipTrimNewLinesRight.sub( "", textRight )
 
             # Remove split element
-            fragments.pop( fragment )
+            clipped.pop()
 
             # Add left text to fragments list
             if rangeLeft is not None:
-                fragments.insert( fragment, Fragment( text=textLeft, type='=', color=0 ) )
-                fragment += 1
+                clipped.append( Fragment( text=textLeft, type='=', color=0 ) )
                 if omittedLeft is not None:
-                    fragments.insert( fragment, Fragment( text='', type=omittedLeft, color=0 ) )
-                    fragment += 1
+                    clipped.append( Fragment( text='', type=omittedLeft, color=0 ) )
 
             # Add fragment container and separator to list
             if rangeLeft is not None and rangeRight is not None:
-                fragments.insert( fragment, Fragment( text='', type=']', color=0 ) )
-                fragment += 1
-                fragments.insert( fragment, Fragment( text='', type=',', color=0 ) )
-                fragment += 1
-                fragments.insert( fragment, Fragment( text='', type='[', color=0 ) )
-                fragment += 1
+                clipped.append( Fragment( text='', type=']', color=0 ) )
+                clipped.append( Fragment( text='', type=',', color=0 ) )
+                clipped.append( Fragment( text='', type='[', color=0 ) )
 
             # Add right text to fragments list
             if rangeRight is not None:
                 if omittedRight is not None:
-                    fragments.insert( fragment, Fragment( text='', type=omittedRight, color=0 ) )
-                    fragment += 1
-                fragments.insert( fragment, Fragment( text=textRight, type='=', color=0 ) )
-                fragment += 1
+                    clipped.append( Fragment( text='', type=omittedRight, color=0 ) )
+                clipped.append( Fragment( text=textRight, type='=', color=0 ) )
+
+        # Update fragments list in place
+        fragments[:] = clipped
 
 
     ##
@@ -2438,38 +2576,48 @@ class WikEdDiff:
         if version not in ['old', 'new']:
             raise Exception("version has to be either 'old' or 'new'")
 
+        newOutput, oldOutput = self.getDiffPlainTexts( fragments )
+        if version == 'new':
+            return newOutput
+        return oldOutput
+
+
+    ##
+    ## Dummy plain text formatter for both versions in a single pass over the fragments.
+    ##
+    ## @param array fragments Fragments array, abstraction layer for diff code
+    ## @return tuple Plain text representations of the diff for new and old version
+    ##
+    def getDiffPlainTexts( self, fragments ):
+
         # Cycle through fragments
-        output = ""
+        newOutput = []
+        oldOutput = []
         for fragment in fragments:
             text = fragment.text
             type = fragment.type
             color = fragment.color
 
-            # Add '=' (unchanged) text and moved block
+            # Add '=' (unchanged) text and moved block, moved block only to new version
             if type == '=':
-                if color != 0:
-                    if version != 'old':
-                        output += text
-                else:
-                    output += text
+                newOutput.append( text )
+                if color == 0:
+                    oldOutput.append( text )
 
-            # Add '-' text
-            elif type == '-' and version == 'old':
-                # For old version skip '-' inside moved group
-                if version == 'new' or color == 0:
-                    output += text
+            # Add '-' text, for old version skip '-' inside moved group
+            elif type == '-':
+                if color == 0:
+                    oldOutput.append( text )
 
             # Add '+' text
-            elif type == '+' and version == 'new':
-                output += text
+            elif type == '+':
+                newOutput.append( text )
 
-            # Add '<' and '>' code
+            # Add '<' and '>' code, display as deletion at original position
             elif type == '<' or type == '>':
-                if version == 'old':
-                    # Display as deletion at original position
-                    output += text
+                oldOutput.append( text )
 
-        return output
+        return "".join(newOutput), "".join(oldOutput)
 
 
     ##
@@ -2481,8 +2629,11 @@ class WikEdDiff:
     ##
     def unitTests( self, oldText, newText, fragments ):
 
+        # Get plain text output for both versions
+        newDiff, oldDiff = self.getDiffPlainTexts( fragments )
+
         # Check if output is consistent with new text
-        diff = self.getDiffPlainText( fragments, 'new' )
+        diff = newDiff
         if diff != newText.text:
             logger.error(
                     'Error: wikEdDiff unit test failure: diff not consistent with new text version!'
@@ -2494,7 +2645,7 @@ class WikEdDiff:
             logger.debug( 'OK: wikEdDiff unit test passed: diff consistent with new text.' )
 
         # Check if output is consistent with old text
-        diff = self.getDiffPlainText( fragments, 'old' )
+        diff = oldDiff
         if diff != oldText.text:
             logger.error(
                     'Error: wikEdDiff unit test failure: diff not consistent with old text version!'
@@ -2513,17 +2664,22 @@ class WikEdDiff:
     ##
     def debugBlocks( self, name, blocks=None ):
 
+        # Skip building the dump if debug messages are not logged
+        if not logger.isEnabledFor( logging.DEBUG ):
+            return
+
         if blocks is None:
             blocks = self.blocks
-        dump = "\n" + "\t".join(["i", "oldBl", "newBl", "oldNm", "newNm", "oldSt", "count", "uniq", "words", "chars", "type", "sect", "group", "fixed", "moved", "text"]) + "\n"
+        dump = ["", "\t".join(["i", "oldBl", "newBl", "oldNm", "newNm", "oldSt", "count", "uniq", "words", "chars", "type", "sect", "group", "fixed", "moved", "text"])]
         for i, block in enumerate(blocks):
-            dump += "\t".join(map(str, [i, block.oldBlock, block.newBlock,
+            dump.append( "\t".join(map(str, [i, block.oldBlock, block.newBlock,
                     block.oldNumber, block.newNumber, block.oldStart,
                     block.count, block.unique, block.words,
                     block.chars, block.type, block.section,
                     block.group, block.fixed, block.moved,
-                    self.debugShortenText( block.text )])) + "\n"
-        logger.debug( name + ':\n' + dump )
+                    self.debugShortenText( block.text )])) )
+        dump.append( "" )
+        logger.debug( name + ':\n' + "\n".join(dump) )
 
 
     ##
@@ -2534,15 +2690,20 @@ class WikEdDiff:
     ##
     def debugGroups( self, name, groups=None ):
 
+        # Skip building the dump if debug messages are not logged
+        if not logger.isEnabledFor( logging.DEBUG ):
+            return
+
         if groups is None:
             groups = self.groups
-        dump = "\n" + "\t".join(["i", "oldNm", "blSta", "blEnd", "uniq", "maxWo", "words", "chars", "fixed", "oldNm", "mFrom", "color"]) + "\n"
+        dump = ["", "\t".join(["i", "oldNm", "blSta", "blEnd", "uniq", "maxWo", "words", "chars", "fixed", "oldNm", "mFrom", "color"])]
         for i, group in enumerate(groups):
-            dump += "\t".join(map(str, [i, group.oldNumber, group.blockStart,
+            dump.append( "\t".join(map(str, [i, group.oldNumber, group.blockStart,
                     group.blockEnd, group.unique, group.maxWords,
                     group.words, group.chars, group.fixed,
-                    group.oldNumber, group.movedFrom, group.color])) + "\n"
-        logger.debug( name + ':\n' + dump )
+                    group.oldNumber, group.movedFrom, group.color])) )
+        dump.append( "" )
+        logger.debug( name + ':\n' + "\n".join(dump) )
 
 
     ##
@@ -2553,11 +2714,16 @@ class WikEdDiff:
     ##
     def debugFragments( self, name, fragments ):
 
-        dump = "\n" + "\t".join(["i", "type", "color", "text"]) + "\n"
+        # Skip building the dump if debug messages are not logged
+        if not logger.isEnabledFor( logging.DEBUG ):
+            return
+
+        dump = ["", "\t".join(["i", "type", "color", "text"])]
         for i, fragment in enumerate(fragments):
-            dump += "\t".join(map(str, [i, fragment.type, fragment.color,
-                    self.debugShortenText( fragment.text, 120, 40 )])) + "\n"
-        logger.debug( name + ':\n' + dump )
+            dump.append( "\t".join(map(str, [i, fragment.type, fragment.color,
+                    self.debugShortenText( fragment.text, 120, 40 )])) )
+        dump.append( "" )
+        logger.debug( name + ':\n' + "\n".join(dump) )
 
 
     ##
@@ -2568,10 +2734,14 @@ class WikEdDiff:
     ##
     def debugBorders( self, name, borders ):
 
-        dump = '\ni \t[ new \told ]\n'
-        for i, border in enumerate(borders):
-            dump += str(i) + ' \t[ ' + str(borders[i][0]) + ' \t' + str(borders[i][1]) + ' ]\n'
-        logger.debug( name, dump )
+        # Skip building the dump if debug messages are not logged
+        if not logger.isEnabledFor( logging.DEBUG ):
+            return
+
+        dump = ['\ni \t[ new \told ]\n']
+        for i, (new, old) in enumerate(borders):
+            dump.append( str(i) + ' \t[ ' + str(new) + ' \t' + str(old) + ' ]\n' )
+        logger.debug( name + ':\n' + ''.join(dump) )
 
 
     ##
@@ -2586,6 +2756,11 @@ class WikEdDiff:
 
         if not isinstance(text, str):
             text = str(text)
+
+        # Short text without newlines and tabs is returned as is
+        if len(text) <= max and "\n" not in text and "\t" not in text:
+            return '"' + text + '"'
+
         text = text.replace("\n", '\\n')
         text = text.replace("\t", '  ')
         if len(text) > max:
@@ -2623,7 +2798,7 @@ class WikEdDiff:
             diff = stop - start
             del self.timer[label]
             if noLog is not True:
-                logger.debug( "{}: {:.2g} s".format(label, diff) )
+                logger.debug( "%s: %.2g s", label, diff )
         return diff
 
 
@@ -2636,7 +2811,7 @@ class WikEdDiff:
     ##
     def timeRecursionEnd( self, text ):
 
-        if len(self.recursionTimer) > 1:
+        if len(self.recursionTimer) > 1 and logger.isEnabledFor( logging.DEBUG ):
             # TODO: WTF? (they are accumulated first..)
             # Subtract times spent in deeper recursions
             timerEnd = len(self.recursionTimer) - 1
@@ -2645,7 +2820,7 @@ class WikEdDiff:
 
             # Log recursion times
             for i in range(len(self.recursionTimer)):
-                logger.debug( "{} recursion {}: {:.2g} s".format(text, i, self.recursionTimer[i]) )
+                logger.debug( "%s recursion %s: %.2g s", text, i, self.recursionTimer[i] )
 
         self.recursionTimer.clear()
 
@@ -2671,39 +2846,33 @@ class WikEdDiffText:
         # @var string text Text of this version
         self.text = str(text)
 
-        # @var array tokens Tokens list
+        # Tokens list, stored as parallel arrays indexed by token index
+
+        # @var array tokens Token strings
         self.tokens = []
 
-        # @var int first, last First and last index of tokens list
-        self.first = None
-        self.last = None
+        # @var array ids Token string ids from parent tokenIds, compared instead of token strings
+        self.ids = []
 
-        # @var array words Word counts for version text
-        self.words = {}
+        # @var array prev, next Previous and next list item (doubly-linked list)
+        self.prev = []
+        self.next = []
 
+        # @var array link Index of corresponding token in new or old text
+        self.link = []
 
-        # Parse and count words and chunks for identification of unique real words
-        if self.parent.config.timer is True:
-            self.parent.time( 'wordParse' )
-        self.wordParse( self.parent.config.regExp.countWords )
-        self.wordParse( self.parent.config.regExp.countChunks )
-        if self.parent.config.timer is True:
-            self.parent.timeEnd( 'wordParse' )
+        # @var array number List enumeration number, -1 before enumeration
+        self.number = array('i')
 
+        # @var bytearray unique Token is unique word in text, one flag byte per token
+        self.unique = bytearray()
 
-    ##
-    ## Parse and count words and chunks for identification of unique words.
-    ##
-    ## @param string regExp Regular expression for counting words
-    ## @param[in] string text Text of version
-    ## @param[out] array words Number of word occurrences
-    ##
-    def wordParse( self, regExp ):
+        # @var int first, last First and last index of tokens list
+        self.first = None
+        self.last = None
 
-        for regExpMatch in regExp.finditer(self.text):
-            word = regExpMatch.group()
-            self.words.setdefault(word, 0)
-            self.words[word] += 1
+        # @var Counter words Word counts for version text, filled by WikEdDiff.wordParse()
+        self.words = Counter()
 
 
     ##
@@ -2726,48 +2895,54 @@ class WikEdDiffText:
             next = None
             text = self.text
         else:
-            prev = self.tokens[token].prev
-            next = self.tokens[token].next
-            text = self.tokens[token].token
+            prev = self.prev[token]
+            next = self.next[token]
+            text = self.tokens[token]
 
         # Split text into tokens, regExp match as separator
-        number = 0
-        split = []
-        lastIndex = 0
         regExp = self.parent.config.regExp.split[level]
-        for regExpMatch in regExp.finditer(text):
-            if regExpMatch.start() > lastIndex:
-                split.append( text[lastIndex : regExpMatch.start()] )
-            split.append(regExpMatch.group())
-            lastIndex = regExpMatch.end()
-        if lastIndex < len(text):
-            split.append( text[ lastIndex: ] )
-
-        # Cycle through new tokens
-        for i in range(len(split)):
-            # Insert current item, link to previous
-            self.tokens.append( Token(
-                    token  = split[i],
-                    prev   = prev,
-                    next   = None,
-                    link   = None,
-                    number = None,
-                    unique = False
-            ) )
-            number += 1
-
-            # Link previous item to current
+        splitCapture = self.parent.splitCaptures.get( regExp )
+        if splitCapture is None:
+            splitCapture = re.compile( '(' + regExp.pattern + ')', regExp.flags )
+            self.parent.splitCaptures[regExp] = splitCapture
+
+        # re.split() returns text between matches, whole match, and inner groups of the split regExp
+        parts = splitCapture.split(text)
+        stride = splitCapture.groups + 1
+        between = parts[0::stride]
+        separators = parts[1::stride]
+
+        # Interleave text between matches and matches, skip empty strings (split regExps do not match empty strings)
+        split = [None] * (len(between) + len(separators))
+        split[0::2] = between
+        split[1::2] = separators
+        split = [part for part in split if part != '']
+
+        # Append new tokens in bulk, new tokens are linked in sequence
+        number = len(split)
+        if number > 0:
+            tokenIds = self.parent.tokenIds
+            self.tokens.extend( split )
+            self.ids.extend( [tokenIds.setdefault( part, len(tokenIds) ) for part in split] )
+            self.prev.append( prev )
+            self.prev.extend( range(current, current + number - 1) )
+            self.next.extend( range(current + 1, current + number) )
+            self.next.append( None )
+            self.link.extend( [None] * number )
+            self.number.extend( array('i', (-1,)) * number )
+            self.unique.extend( bytes(number) )
+
+            # Link previous item to first new item
             if prev is not None:
-                self.tokens[prev].next = current
-            prev = current
-            current += 1
+                self.next[prev] = current
+            prev = current + number - 1
 
         # Connect last new item and existing next item
         if number > 0 and token is not None:
             if prev is not None:
-                self.tokens[prev].next = next
+                self.next[prev] = next
             if next is not None:
-                self.tokens[next].prev = prev
+                self.prev[next] = prev
 
         # Set text first and last token index
         if number > 0:
@@ -2789,16 +2964,24 @@ class WikEdDiffText:
     ##
     ## @param string level Level of splitting: line, sentence, chunk, or word
     ## @param[in] array tokens Tokens list
+    ## @return int Number of refined tokens, 0 if all tokens are linked
     ##
     def splitRefine( self, regExp ):
 
+        # Bind token lists, splitText() only appends to them
+        link = self.link
+        next = self.next
+
         # Cycle through tokens list
+        refined = 0
         i = self.first
         while i is not None:
             # Refine unique unmatched tokens into smaller tokens
-            if self.tokens[i].link is None:
+            if link[i] is None:
                 self.splitText( regExp, i )
-            i = self.tokens[i].next
+                refined += 1
+            i = next[i]
+        return refined
 
 
     ##
@@ -2808,13 +2991,64 @@ class WikEdDiffText:
     ##
     def enumerateTokens(self):
 
+        # Bind token lists
+        numbers = self.number
+        next = self.next
+
         # Enumerate tokens list
         number = 0
         i = self.first
         while i is not None:
-            self.tokens[i].number = number
+            numbers[i] = number
             number += 1
-            i = self.tokens[i].next
+            i = next[i]
+
+
+    ##
+    ## Collect runs of consecutive unlinked tokens, used for deletion and insertion blocks.
+    ##
+    ## @param[in] array tokens, next, link Tokens list
+    ## @return array List of (first token index, list of token strings) tuples in text order
+    ##
+    def getUnlinkedRuns(self):
+
+        tokens = self.tokens
+        next = self.next
+        link = self.link
+
+        runs = []
+        i = self.first
+        while i is not None:
+            # Skip linked tokens
+            if link[i] is not None:
+                i = next[i]
+                continue
+
+            # Collect run of unlinked tokens
+            start = i
+            run = []
+            while i is not None and link[i] is None:
+                run.append( tokens[i] )
+                i = next[i]
+            runs.append( (start, run) )
+
+        return runs
+
+
+    ##
+    ## Free tokens list.
+    ##
+    ## @param[out] array tokens, ids, prev, next, link, number, unique Tokens list
+    ##
+    def clearTokens(self):
+
+        self.tokens.clear()
+        self.ids.clear()
+        self.prev.clear()
+        self.next.clear()
+        self.link.clear()
+        del self.number[:]
+        self.unique.clear()
 
 
     ##
@@ -2826,13 +3060,16 @@ class WikEdDiffText:
     ##
     def debugText( self, name ):
 
-        tokens = self.tokens
-        dump = 'first: ' + str(self.first) + '\tlast: ' + str(self.last) + '\n'
-        dump += '\ni \tlink \t(prev \tnext) \tuniq \t#num \t"token"\n'
+        # Skip building the dump if debug messages are not logged
+        if not logger.isEnabledFor( logging.DEBUG ):
+            return
+
+        dump = ['first: ' + str(self.first) + '\tlast: ' + str(self.last) + '\n']
+        dump.append( '\ni \tlink \t(prev \tnext) \tuniq \t#num \t"token"\n' )
         i = self.first
         while i is not None:
-            dump += "{} \t{} \t({} \t{}) \t{} \t#{} \t{}\n".format(i, tokens[i].link, tokens[i].prev, tokens[i].next,
-                                                                   tokens[i].unique, tokens[i].number,
-                                                                   self.parent.debugShortenText( tokens[i].token ))
-            i = tokens[i].next
-        logger.debug( name + ':\n' + dump )
+            dump.append( "{} \t{} \t({} \t{}) \t{} \t#{} \t{}\n".format(i, self.link[i], self.prev[i], self.next[i],
+                                                                   bool(self.unique[i]), self.number[i] if self.number[i] >= 0 else None,
+                                                                   self.parent.debugShortenText( self.tokens[i] )) )
+            i = self.next[i]
+        logger.debug( name + ':\n' + ''.join(dump) )
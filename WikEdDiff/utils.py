@@ -6,8 +6,8 @@ Python-specific helpers for the WikEdDiff class.
 
 # Helper class to access dict elements both as attributes and items; with recursive constructor.
 # source: https://stackoverflow.com/questions/3031219/python-recursively-access-dict-via-attributes-as-well-as-index-access/3031270#3031270
+# Missing keys raise KeyError for item access and AttributeError for attribute access.
 class dotdictify(dict):
-    marker = object()
     def __init__(self, value=None):
         if value is None:
             pass
@@ -22,18 +22,54 @@ class dotdictify(dict):
             value = dotdictify(value)
         super(dotdictify, self).__setitem__(key, value)
 
-    def __getitem__(self, key):
-        found = self.get(key, dotdictify.marker)
-        if found is dotdictify.marker:
-            found = dotdictify()
-            super(dotdictify, self).__setitem__(key, found)
-        return found
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
 
     __setattr__ = __setitem__
-    __getattr__ = __getitem__
 
 
-def int_or_null(value):
-    if value is None:
-        return 0
-    return value
+# Length of the common start of two strings, found by a binary search over halving ranges.
+# Only the range of b is sliced, it is compared in place in a with startswith.
+def common_prefix_length(a, b):
+    low = 0
+    high = min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a.startswith(b[low:mid], low):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+# Length of the common end of two strings, up to maxLength characters.
+# Only the range of b is sliced, it is compared in place in a with endswith.
+def common_suffix_length(a, b, maxLength):
+    low = 0
+    high = min(len(a), len(b), maxLength)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a.endswith(b[len(b) - mid : len(b) - low], 0, len(a) - low):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+# Expand the source of a regExp character class (without brackets, with \u escapes and ranges)
+# into the set of its characters.
+def char_class_set(source):
+    chars = source.encode('ascii').decode('unicode_escape')
+    result = set()
+    i = 0
+    while i < len(chars):
+        if i + 2 < len(chars) and chars[i + 1] == '-':
+            result.update(map(chr, range(ord(chars[i]), ord(chars[i + 2]) + 1)))
+            i += 3
+        else:
+            result.add(chars[i])
+            i += 1
+    return frozenset(result)
@@ -10,5 +10,4 @@ setup(
     license="GPLv3",
     packages=["WikEdDiff"],
     scripts=["wiked-diff"],
-    install_requires=["namedlist"]
 )
@@ -0,0 +1,67 @@
+#! /usr/bin/env python3
+
+import copy
+import unittest
+
+from WikEdDiff.utils import dotdictify, common_prefix_length, common_suffix_length
+
+
+class DotdictifyTest(unittest.TestCase):
+
+    def test_access(self):
+        d = dotdictify({'a': {'b': 1}})
+        self.assertIsInstance(d.a, dotdictify)
+        self.assertEqual(d.a.b, 1)
+        self.assertEqual(d['a']['b'], 1)
+
+    def test_set(self):
+        d = dotdictify()
+        d.a = {'b': 1}
+        self.assertIsInstance(d['a'], dotdictify)
+        self.assertEqual(d.a.b, 1)
+
+    def test_missing_key(self):
+        d = dotdictify({'a': {'b': 1}})
+        with self.assertRaises(AttributeError):
+            d.missing
+        with self.assertRaises(AttributeError):
+            d.a.missing
+        with self.assertRaises(KeyError):
+            d['missing']
+        self.assertFalse(hasattr(d, 'missing'))
+        self.assertEqual(d, {'a': {'b': 1}})
+
+    def test_deepcopy(self):
+        d = dotdictify({'a': {'b': 1}})
+        c = copy.deepcopy(d)
+        c.a.b = 2
+        self.assertIsInstance(c.a, dotdictify)
+        self.assertEqual(d.a.b, 1)
+        self.assertEqual(c.a.b, 2)
+
+
+class CommonLengthTest(unittest.TestCase):
+
+    def test_prefix(self):
+        self.assertEqual(common_prefix_length('', 'abc'), 0)
+        self.assertEqual(common_prefix_length('abc', 'xbc'), 0)
+        self.assertEqual(common_prefix_length('abcd', 'abxd'), 2)
+        self.assertEqual(common_prefix_length('ab', 'abcd'), 2)
+        self.assertEqual(common_prefix_length('abcd', 'abcd'), 4)
+
+    def test_suffix(self):
+        self.assertEqual(common_suffix_length('', 'abc', 3), 0)
+        self.assertEqual(common_suffix_length('abc', 'abx', 3), 0)
+        self.assertEqual(common_suffix_length('abcd', 'axcd', 4), 2)
+        self.assertEqual(common_suffix_length('cd', 'abcd', 4), 2)
+        self.assertEqual(common_suffix_length('abcd', 'abcd', 4), 4)
+        self.assertEqual(common_suffix_length('abcd', 'abcd', 3), 3)
+
+    def test_overlap(self):
+        # Prefix and suffix of a token may overlap, e.g. 'aba' in 'ab-ba'
+        self.assertEqual(common_prefix_length('aba', 'ab-ba'), 2)
+        self.assertEqual(common_suffix_length('aba', 'ab-ba', 3), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()